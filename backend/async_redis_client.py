@@ -0,0 +1,288 @@
+"""
+Async Redis Client Configuration
+asyncio counterpart of redis_client for non-blocking request paths
+
+Follows redis_client's mode: a single server, or a Redis Cluster when
+REDIS_CLUSTER_NODES is set. On a single server, connections share
+redis_client's circuit breaker.
+"""
+import redis.asyncio as aioredis
+from redis.asyncio.cluster import RedisCluster, ClusterNode
+from typing import Optional, Any
+
+import time
+from redis.exceptions import (
+    ConnectionError as RedisConnectionError,
+    TimeoutError as RedisTimeoutError,
+    RedisError
+)
+
+import serialization
+from redis_client import (
+    REDIS_URL,
+    REDIS_TLS,
+    CLUSTER_MODE,
+    CircuitOpenError,
+    PoolMetrics,
+    circuit_breaker,
+    get_pool_kwargs,
+    get_cluster_kwargs,
+    get_cluster_nodes,
+    is_unavailable_error
+)
+
+
+class BreakerConnection(aioredis.Connection):
+    """
+    Async connection that reports to the shared circuit breaker
+    """
+
+    async def connect(self):
+        if circuit_breaker.is_open():
+            raise CircuitOpenError("Redis circuit is open")
+        try:
+            await super().connect()
+        except (RedisConnectionError, RedisTimeoutError) as e:
+            circuit_breaker.record_failure(e)
+            raise
+
+    async def send_packed_command(self, command, check_health=True):
+        if not circuit_breaker.allow(self):
+            raise CircuitOpenError("Redis circuit is open")
+        try:
+            await super().send_packed_command(command, check_health)
+        except CircuitOpenError:
+            raise
+        except (RedisConnectionError, RedisTimeoutError) as e:
+            circuit_breaker.record_failure(e)
+            raise
+
+    async def read_response(self, *args, **kwargs):
+        try:
+            response = await super().read_response(*args, **kwargs)
+        except (RedisConnectionError, RedisTimeoutError) as e:
+            circuit_breaker.record_failure(e)
+            raise
+        except RedisError:
+            circuit_breaker.record_success()
+            raise
+        circuit_breaker.record_success()
+        return response
+
+
+class BreakerSSLConnection(BreakerConnection, aioredis.SSLConnection):
+    """
+    BreakerConnection over TLS, for rediss:// URLs
+    """
+
+
+class InstrumentedConnectionPool(aioredis.BlockingConnectionPool):
+    """
+    Async blocking pool with a hard connection limit and acquisition metrics
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.metrics = PoolMetrics()
+        super().__init__(*args, **kwargs)
+
+    async def get_connection(self, command_name, *keys, **options):
+        start = time.perf_counter()
+        try:
+            connection = await super().get_connection(command_name, *keys, **options)
+        except RedisConnectionError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_acquire(time.perf_counter() - start)
+        return connection
+
+    def get_stats(self) -> dict:
+        return self.metrics.snapshot(
+            in_use=len(self._in_use_connections),
+            idle=len(self._available_connections),
+            max_connections=self.max_connections
+        )
+
+
+if CLUSTER_MODE:
+    # Each node gets its own pool; max_connections applies per node
+    connection_pool = None
+    redis_client = RedisCluster(
+        startup_nodes=[ClusterNode(node.host, node.port) for node in get_cluster_nodes()],
+        **get_cluster_kwargs()
+    )
+else:
+    # Shared connection pool for every coroutine in this process
+    if REDIS_URL:
+        # An explicit connection_class replaces the SSLConnection redis-py
+        # would pick for rediss://, so the TLS variant is chosen here
+        connection_pool = InstrumentedConnectionPool.from_url(
+            REDIS_URL,
+            connection_class=BreakerSSLConnection if REDIS_TLS else BreakerConnection,
+            **get_pool_kwargs()
+        )
+    else:
+        connection_pool = InstrumentedConnectionPool(
+            connection_class=BreakerConnection, **get_pool_kwargs()
+        )
+
+    # Create async Redis client
+    redis_client = aioredis.Redis(connection_pool=connection_pool)
+
+
+async def check_redis_connection() -> bool:
+    """
+    Check if Redis connection is healthy
+
+    Returns:
+        bool: True if connected, False otherwise
+    """
+    try:
+        await redis_client.ping()
+        return True
+    except Exception as e:
+        print(f"❌ Async Redis connection failed: {e}")
+        return False
+
+
+async def get_value(key: str, deserialize: bool = True) -> Optional[Any]:
+    """
+    Get a value from Redis
+
+    Args:
+        key: Redis key
+        deserialize: Whether to decode the value (tagged codec or legacy JSON)
+
+    Returns:
+        The value or None if not found
+    """
+    try:
+        value = await redis_client.get(key)
+
+        if value is None:
+            return None
+
+        if deserialize:
+            return serialization.decode(value)
+
+        return value
+    except Exception as e:
+        print(f"❌ Async Redis get failed for key '{key}': {e}")
+        return None
+
+
+async def set_value(key: str, value: Any, expire: Optional[int] = None) -> bool:
+    """
+    Set a value in Redis with optional expiration
+
+    Args:
+        key: Redis key
+        value: Value to store (encoded with the default codec if not a string)
+        expire: Expiration time in seconds (optional)
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        if not isinstance(value, str):
+            value = serialization.encode(value)
+
+        if expire:
+            await redis_client.setex(key, expire, value)
+        else:
+            await redis_client.set(key, value)
+
+        return True
+    except Exception as e:
+        print(f"❌ Async Redis set failed for key '{key}': {e}")
+        return False
+
+
+def pipeline():
+    """
+    Create a non-transactional pipeline for batching commands
+
+    Returns:
+        Pipeline: Async Redis pipeline (await execute() to send the batch)
+    """
+    return redis_client.pipeline(transaction=False)
+
+
+def register_script(source: str):
+    """
+    Register a Lua script with the async Redis client
+
+    Args:
+        source: Lua script source
+
+    Returns:
+        AsyncScript: Awaitable Redis script object (EVALSHA with fallback)
+    """
+    return redis_client.register_script(source)
+
+
+async def run_script(script, keys: list, args: list,
+                     raise_unavailable: bool = False) -> Optional[Any]:
+    """
+    Execute a registered Lua script in a single round trip
+
+    Args:
+        script: Script object returned by register_script
+        keys: Redis keys the script touches (KEYS)
+        args: Additional script arguments (ARGV)
+        raise_unavailable: Re-raise connection errors and timeouts (including an
+            open circuit) instead of returning None
+
+    Returns:
+        The script result or None if execution failed
+    """
+    try:
+        return await script(keys=keys, args=args)
+    except Exception as e:
+        if raise_unavailable and is_unavailable_error(e):
+            raise
+        print(f"❌ Async Redis script failed for keys {keys}: {e}")
+        return None
+
+
+async def publish(channel: str, message: str) -> int:
+    """
+    Publish a message on a pub/sub channel
+
+    Args:
+        channel: Channel name
+        message: Message payload
+
+    Returns:
+        int: Number of subscribers that received the message (0 on failure)
+    """
+    try:
+        return await redis_client.publish(channel, message)
+    except Exception as e:
+        print(f"❌ Async Redis publish failed for channel '{channel}': {e}")
+        return 0
+
+
+def get_pool_stats() -> dict:
+    """
+    Get async connection pool gauges
+
+    Returns:
+        dict: in_use, idle, max_connections, acquire counts and wait times
+            (in cluster mode only the number of known nodes)
+    """
+    if CLUSTER_MODE:
+        return {"cluster": True, "nodes": len(redis_client.get_nodes())}
+    return connection_pool.get_stats()
+
+
+async def close_redis_connections() -> None:
+    """
+    Close all pooled connections
+    Should be called on application shutdown
+    """
+    try:
+        await redis_client.aclose()
+        if connection_pool is not None:
+            await connection_pool.disconnect()
+    except Exception as e:
+        print(f"⚠️  Error closing async Redis connections: {e}")
@@ -0,0 +1,118 @@
+"""
+Async Redis-based Session Management
+Non-blocking versions of the session_manager hot-path operations
+
+Shares the key layout, Lua scripts and in-process cache with
+session_manager, so both can serve the same sessions side by side.
+"""
+import asyncio
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+from async_redis_client import register_script, run_script, publish
+from redis_client import is_unavailable_error
+import session_manager
+import session_cache
+import session_persistence
+
+
+_touch_session_script = register_script(session_manager._TOUCH_SESSION_LUA)
+_delete_session_script = register_script(session_manager._DELETE_SESSION_LUA)
+
+
+async def get_session(token: str, user_id: Optional[str] = None,
+                      generation: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """
+    Retrieve session data from Redis without blocking the event loop
+
+    Same semantics as session_manager.get_session: one round trip that
+    reads the session and applies activity tracking and sliding expiry.
+
+    Args:
+        token: JWT access token
+        user_id: Token subject (optional, enables the generation check)
+        generation: Session generation claimed by the token (optional)
+
+    Returns:
+        dict: Session data or None if not found/expired
+
+    Raises:
+        SessionStoreUnavailable: Redis is unreachable (or its circuit is open)
+    """
+    try:
+        session_key = session_manager._get_session_key(token)
+
+        cached = session_cache.cache.get(session_key)
+        if cached is not None:
+            return cached
+
+        result = await run_script(
+            _touch_session_script,
+            keys=session_manager._touch_keys(session_key, user_id, generation),
+            args=session_manager._touch_args(datetime.utcnow(), generation),
+            raise_unavailable=True
+        )
+
+        if result == 0:
+            await asyncio.to_thread(session_manager._unindex_session, session_key, user_id)
+            session_persistence.record_ended([session_key], "revoked")
+            print(f"🚫 Revoked session rejected for user: {user_id}")
+            return None
+
+        if not result:
+            return None
+
+        fields, ttl, refreshed = result
+        session_data = session_manager._decode_fields(fields)
+
+        if refreshed:
+            # Rare path (once per refresh window): reuse the sync bookkeeping
+            await asyncio.to_thread(
+                session_manager._index_refreshed_session, session_key, session_data
+            )
+        session_persistence.record_session(session_key, session_data, ttl)
+
+        session_cache.cache.set(session_key, session_data, ttl if ttl > 0 else None)
+        return session_data
+
+    except Exception as e:
+        if is_unavailable_error(e):
+            raise session_manager.SessionStoreUnavailable(str(e)) from e
+        print(f"❌ Error getting session: {e}")
+        return None
+
+
+async def delete_session(token: str) -> bool:
+    """
+    Delete session from Redis (logout) without blocking the event loop
+
+    Args:
+        token: JWT access token
+
+    Returns:
+        bool: True if deleted successfully
+    """
+    try:
+        session_key = session_manager._get_session_key(token)
+        result = await run_script(_delete_session_script, keys=[session_key], args=[])
+
+        session_cache.cache.delete(session_key)
+        await publish(
+            session_cache.INVALIDATION_CHANNEL,
+            f"{session_cache.KEY_MESSAGE}{session_key}"
+        )
+
+        if not result or not result[0]:
+            print(f"⚠️  Session not found (may be already expired)")
+            return True  # Consider it success if session doesn't exist
+
+        _, user_id = result
+        await asyncio.to_thread(session_manager._unindex_session, session_key, user_id)
+        session_persistence.record_ended([session_key], "logout")
+
+        print(f"✅ Session deleted for user: {user_id}")
+        return True
+
+    except Exception as e:
+        print(f"❌ Error deleting session: {e}")
+        return False
@@ -2,18 +2,24 @@
 Authentication Module
 Password hashing, JWT tokens, and auth dependencies all in one place
 """
-import bcrypt
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from typing import Optional
 from fastapi import Depends, HTTPException, status, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import os
+import secrets
+import time
 
-from database import get_db
+from database import get_async_db
 from models import User
+from redis_client import circuit_breaker
+from session_cache import SessionCache
 import session_manager
+import async_session_manager
+import principal_cache
+import password_pool
 
 # ==================== Configuration ====================
 
@@ -21,21 +27,83 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
+# Verified token payloads, keyed by token digest, each kept until the token's exp
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
+TOKEN_CACHE_MAX_TTL = float(os.getenv("TOKEN_CACHE_MAX_TTL", "3600"))  # seconds
+
+# What to do with authenticated requests while Redis is unreachable:
+#   deny     - reject with 503 so clients retry later instead of logging in again
+#   jwt_only - accept a valid JWT without the session check (logout and
+#              revocation are not enforced until Redis is back)
+SESSION_STORE_OUTAGE_POLICY = os.getenv("SESSION_STORE_OUTAGE_POLICY", "deny").lower()
+
 security = HTTPBearer()
 
+_verified_tokens = SessionCache(TOKEN_CACHE_MAX_ENTRIES, TOKEN_CACHE_MAX_TTL)
+
 
 # ==================== Password Hashing ====================
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify password against hash"""
-    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+# bcrypt runs in password_pool's bounded process pool; when it is saturated
+# callers get a 503 right away instead of tying up a request worker.
+
+def password_pool_busy_exception() -> HTTPException:
+    """503 returned when the password hashing pool sheds load"""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many login attempts in progress, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password using bcrypt"""
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-    return hashed.decode('utf-8')
+    """
+    Hash a password using bcrypt (in the bcrypt process pool)
+
+    Blocking; kept for seed_data.py, which runs outside the event loop.
+    Request handlers use get_password_hash_async.
+    """
+    try:
+        return password_pool.hash_password(password)
+    except password_pool.PasswordPoolFull:
+        raise password_pool_busy_exception()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify password against hash (awaits the bcrypt pool without a thread)"""
+    try:
+        return await password_pool.verify_password_async(plain_password, hashed_password)
+    except password_pool.PasswordPoolFull:
+        raise password_pool_busy_exception()
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Async variant of get_password_hash"""
+    try:
+        return await password_pool.hash_password_async(password)
+    except password_pool.PasswordPoolFull:
+        raise password_pool_busy_exception()
+
+
+async def rehash_password_async(plain_password: str, hashed_password: str) -> Optional[str]:
+    """
+    Re-hash a just-verified password if its bcrypt cost isn't BCRYPT_ROUNDS
+
+    Skipped when the pool is busy; the next login tries again.
+
+    Args:
+        plain_password: Password that matched hashed_password
+        hashed_password: Stored hash
+
+    Returns:
+        str: New hash to store, or None if no change is needed (or possible now)
+    """
+    if not password_pool.needs_rehash(hashed_password):
+        return None
+    try:
+        return await password_pool.hash_password_async(plain_password)
+    except password_pool.PasswordPoolFull:
+        return None
 
 
 # ==================== JWT Token Management ====================
@@ -49,35 +117,99 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
 
-    to_encode.update({"exp": expire})
+    # Embed the user's session generation so "log out everywhere" is a single INCR
+    if "gen" not in to_encode and to_encode.get("sub"):
+        to_encode["gen"] = session_manager.get_user_generation(to_encode["sub"])
+
+    # iat/jti make every issued token (and so its session key) unique, even
+    # for the same user and generation within one second
+    to_encode.update({"exp": expire, "iat": datetime.utcnow(), "jti": secrets.token_hex(8)})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
     return encoded_jwt
 
 
 def decode_access_token(token: str) -> Optional[dict]:
-    """Decode and verify JWT token"""
+    """
+    Decode and verify JWT token
+
+    Verified payloads are memoized by token digest until the token's exp,
+    so repeated requests with the same token skip the HMAC check and JSON
+    decode. Session checks still run on every request.
+    """
+    token_key = session_manager.get_session_id(token)
+    payload = _verified_tokens.get(token_key)
+    if payload is not None:
+        return payload
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         return None
 
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        _verified_tokens.set(token_key, payload, exp - time.time())
+    return payload
+
+
+def get_token_cache_stats() -> dict:
+    """Verified-token cache size and hit/miss counters"""
+    return _verified_tokens.stats()
+
+
+# ==================== Session Store Outages ====================
+
+def session_store_unavailable_exception() -> HTTPException:
+    """503 telling clients when the session store will be probed again"""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Session store unavailable, please retry shortly",
+        headers={"Retry-After": str(max(1, int(circuit_breaker.reset_timeout)))},
+    )
+
+
+def apply_session_store_outage_policy(user_id: str) -> None:
+    """
+    Decide whether a request may proceed without its Redis session
+
+    Raises:
+        HTTPException: 503 unless the policy is jwt_only
+    """
+    if SESSION_STORE_OUTAGE_POLICY != "jwt_only":
+        raise session_store_unavailable_exception()
+    print(f"⚠️  Session store unavailable, accepting JWT only for user: {user_id}")
+
+
+def ensure_session_store_available() -> None:
+    """
+    Fail fast before expensive work (e.g., bcrypt on login) while the
+    Redis circuit is open and sessions can't be created
+
+    Raises:
+        HTTPException: 503 if the circuit is open and the policy is deny
+    """
+    if SESSION_STORE_OUTAGE_POLICY != "jwt_only" and circuit_breaker.is_open():
+        raise session_store_unavailable_exception()
+
 
 # ==================== FastAPI Dependencies ====================
 
-def get_current_user(
+async def get_current_user_async(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
     """
     Get current authenticated user from JWT token with Redis session validation
 
     This validates:
     1. JWT token signature and expiration
-    2. Redis session existence
-    3. User exists in database
+    2. Redis session existence and session generation
+    3. User exists (principal cache, database on a miss)
     4. User is active
+
+    The Redis session lookup, the principal cache and (on a miss) the users
+    query are all awaited on the event loop, so no threadpool worker is held.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -103,19 +235,25 @@ def get_current_user(
         raise credentials_exception
 
     # Step 2: Validate Redis session
-    session_data = session_manager.get_session(token)
-    if session_data is None:
-        raise session_expired_exception
+    try:
+        session_data = await async_session_manager.get_session(
+            token, user_id=user_id, generation=payload.get("gen", 0)
+        )
+    except session_manager.SessionStoreUnavailable:
+        apply_session_store_outage_policy(user_id)
+    else:
+        if session_data is None:
+            raise session_expired_exception
 
-    # Step 3: Query user from database
-    user = db.query(User).filter(User.user_id == user_id).first()
+    # Step 3: Load user (principal cache, database on a miss)
+    user = await principal_cache.load_user_async(user_id, db)
     if user is None:
         raise credentials_exception
 
     # Step 4: Check if user is active
     if not user.is_active:
         # Delete session for inactive user
-        session_manager.delete_session(token)
+        await async_session_manager.delete_session(token)
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is inactive"
@@ -124,8 +262,8 @@ def get_current_user(
     return user
 
 
-def require_admin(current_user: User = Depends(get_current_user)) -> User:
-    """Require admin or super_admin role"""
+async def require_admin_async(current_user: User = Depends(get_current_user_async)) -> User:
+    """Require admin or super_admin role (async dependency chain)"""
     if not current_user.is_admin_role():
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -134,8 +272,8 @@ def require_admin(current_user: User = Depends(get_current_user)) -> User:
     return current_user
 
 
-def require_super_admin(current_user: User = Depends(get_current_user)) -> User:
-    """Require super_admin role"""
+async def require_super_admin_async(current_user: User = Depends(get_current_user_async)) -> User:
+    """Require super_admin role (async dependency chain)"""
     if not current_user.is_super_admin_role():
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
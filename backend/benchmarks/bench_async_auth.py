@@ -0,0 +1,73 @@
+"""
+Benchmark: concurrent /auth/me throughput, threadpool vs event-loop handler
+
+Serves the backend app in-process with two extra routes that return the
+current user through get_current_user_async: a sync handler (dispatched
+to the threadpool) and an async handler (runs on the event loop), then
+drives each with many concurrent keep-alive connections and reports
+throughput and latency.
+
+Needs the database and Redis from docker-compose. The in-process session
+cache is disabled by default so every request reaches Redis.
+
+Usage:
+    python benchmarks/bench_async_auth.py --concurrency 200 --duration 10
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import BENCH_USER, BENCH_PASSWORD, login, run_load
+
+
+def _serve(port: int, with_cache: bool) -> None:
+    """Start the app with the benchmark routes on a background thread"""
+    if not with_cache:
+        os.environ["SESSION_CACHE_MAX_ENTRIES"] = "0"
+
+    import uvicorn
+    from fastapi import Depends
+    from auth import get_current_user_async
+    from main import app
+
+    @app.get("/bench/sync-me")
+    def sync_me(current_user=Depends(get_current_user_async)):
+        return {"user_id": current_user.user_id}
+
+    @app.get("/bench/async-me")
+    async def async_me(current_user=Depends(get_current_user_async)):
+        return {"user_id": current_user.user_id}
+
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+
+    while not server.started:
+        time.sleep(0.1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare threadpool and event-loop /auth/me handler throughput")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--user", default=BENCH_USER)
+    parser.add_argument("--password", default=BENCH_PASSWORD)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--with-cache", action="store_true", help="Keep the in-process session cache on")
+    args = parser.parse_args()
+
+    _serve(args.port, args.with_cache)
+    token = login(args.user, args.password, base_url=f"http://127.0.0.1:{args.port}")
+
+    for path in ("/bench/sync-me", "/bench/async-me"):
+        print(asyncio.run(run_load(args.port, path, token, args.concurrency, args.duration)))
+
+
+if __name__ == "__main__":
+    main()
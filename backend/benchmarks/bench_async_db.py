@@ -0,0 +1,90 @@
+"""
+Benchmark: concurrent database-bound requests, sync threadpool vs asyncpg
+
+Serves the backend app in-process with two extra routes that run the same
+users query with a simulated slow statement (pg_sleep): one sync handler
+on a psycopg2 session (runs in the threadpool, 40 threads by default) and
+one async handler on an asyncpg session. Both engines get the same pool
+size, so the difference is the threadpool limit. The real async admin
+endpoint /api/admin/users is measured as well.
+
+Needs the database and Redis from docker-compose and an admin account.
+
+Usage:
+    python benchmarks/bench_async_db.py --concurrency 200 --duration 10 --db-latency-ms 20
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import BENCH_USER, BENCH_PASSWORD, login, run_load
+
+
+def _serve(port: int, pool_size: int, db_latency: float) -> None:
+    """Start the app with the benchmark routes on a background thread"""
+    os.environ["ASYNC_DB_POOL_SIZE"] = str(pool_size)
+    os.environ["ASYNC_DB_MAX_OVERFLOW"] = "0"
+
+    import uvicorn
+    from fastapi import Depends
+    from sqlalchemy import create_engine, select, text
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import Session, sessionmaker
+    from database import DATABASE_URL, get_async_db
+    from models import User
+    from main import app
+
+    sync_engine = create_engine(DATABASE_URL, pool_size=pool_size, max_overflow=0)
+    SyncSession = sessionmaker(bind=sync_engine)
+
+    def get_sync_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @app.get("/bench/sync-users")
+    def sync_users(db: Session = Depends(get_sync_db)):
+        db.execute(text("SELECT pg_sleep(:delay)"), {"delay": db_latency})
+        return {"users": len(db.execute(select(User.user_id).limit(10)).all())}
+
+    @app.get("/bench/async-users")
+    async def async_users(db: AsyncSession = Depends(get_async_db)):
+        await db.execute(text("SELECT pg_sleep(:delay)"), {"delay": db_latency})
+        return {"users": len((await db.execute(select(User.user_id).limit(10))).all())}
+
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+
+    while not server.started:
+        time.sleep(0.1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sync and async database-bound request throughput")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--user", default=BENCH_USER, help="Admin account (for /api/admin/users)")
+    parser.add_argument("--password", default=BENCH_PASSWORD)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--pool-size", type=int, default=100, help="Connections per engine")
+    parser.add_argument("--db-latency-ms", type=float, default=20.0, help="Simulated query time")
+    args = parser.parse_args()
+
+    _serve(args.port, args.pool_size, args.db_latency_ms / 1000)
+    token = login(args.user, args.password, base_url=f"http://127.0.0.1:{args.port}")
+
+    for path in ("/bench/sync-users", "/bench/async-users", "/api/admin/users?page_size=10"):
+        print(asyncio.run(run_load(args.port, path, token, args.concurrency, args.duration)))
+
+
+if __name__ == "__main__":
+    main()
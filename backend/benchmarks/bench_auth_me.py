@@ -0,0 +1,45 @@
+"""
+Benchmark: GET /api/auth/me latency
+
+Measures p50/p99 latency of the authenticated /api/auth/me endpoint,
+which runs session_manager.get_session on every request.
+
+Usage (against a running stack):
+    python benchmarks/bench_auth_me.py --requests 2000
+
+Run it once on the previous revision and once on the current one
+to compare the session lookup cost.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import BASE_URL, BENCH_USER, BENCH_PASSWORD, login, request_json, timed, summarize
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /api/auth/me latency")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--user", default=BENCH_USER)
+    parser.add_argument("--password", default=BENCH_PASSWORD)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=50)
+    args = parser.parse_args()
+
+    token = login(args.user, args.password, base_url=args.base_url)
+
+    for _ in range(args.warmup):
+        request_json("GET", "/api/auth/me", token=token, base_url=args.base_url)
+
+    samples = [
+        timed(request_json, "GET", "/api/auth/me", token=token, base_url=args.base_url)
+        for _ in range(args.requests)
+    ]
+
+    print(f"GET /api/auth/me: {summarize(samples)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: codec encode/decode cost and payload size
+
+Times encode and decode of a typical session dict with every available
+codec (plus msgpack for size/speed reference if installed).
+
+Usage:
+    python benchmarks/bench_codecs.py --iterations 100000
+"""
+import argparse
+import os
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import serialization
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+def _session_dict() -> dict:
+    now = datetime.utcnow().isoformat()
+    return {
+        "user_id": "user000123",
+        "user_name": "Test User",
+        "email": "user000123@example.com",
+        "role": "user",
+        "ip_address": "10.0.0.1",
+        "created_at": now,
+        "last_activity": now
+    }
+
+
+def _report(name: str, encode, decode, value, iterations: int) -> None:
+    payload = encode(value)
+    encode_us = timeit.timeit(lambda: encode(value), number=iterations) / iterations * 1e6
+    decode_us = timeit.timeit(lambda: decode(payload), number=iterations) / iterations * 1e6
+    print({
+        "codec": name,
+        "encode_us": round(encode_us, 3),
+        "decode_us": round(decode_us, 3),
+        "payload_bytes": len(payload.encode("utf-8") if isinstance(payload, str) else payload)
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Redis payload codecs")
+    parser.add_argument("--iterations", type=int, default=100000)
+    args = parser.parse_args()
+
+    value = _session_dict()
+
+    for codec in serialization.CODECS.values():
+        _report(
+            codec.__name__,
+            lambda v, c=codec: c.tag + c.encode(v),
+            serialization.decode,
+            value,
+            args.iterations
+        )
+
+    if msgpack is not None:
+        _report("msgpack (binary, reference only)", msgpack.packb, msgpack.unpackb, value, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark: HS256 access token verification cost
+
+Times verification of a typical access token with python-jose (current),
+PyJWT (if installed), a minimal stdlib hmac/json verifier (lower bound for
+any HS256 implementation) and the memoized auth.decode_access_token hit.
+
+Usage:
+    python benchmarks/bench_jwt.py --iterations 50000
+"""
+import argparse
+import base64
+import hashlib
+import hmac
+import json
+import os
+import sys
+import time
+import timeit
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jose import jwt as jose_jwt
+
+try:
+    import jwt as pyjwt
+except ImportError:
+    pyjwt = None
+
+SECRET_KEY = "benchmark-secret-key-at-least-32-characters"
+ALGORITHM = "HS256"
+
+
+def _b64decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def stdlib_decode(token: str, key: str) -> dict:
+    """Minimal HS256 verification (signature, alg and exp only)"""
+    header_b64, payload_b64, signature_b64 = token.split(".")
+    if json.loads(_b64decode(header_b64)).get("alg") != ALGORITHM:
+        raise ValueError("Unexpected algorithm")
+    expected = hmac.new(key.encode("utf-8"), f"{header_b64}.{payload_b64}".encode("ascii"), hashlib.sha256).digest()
+    if not hmac.compare_digest(expected, _b64decode(signature_b64)):
+        raise ValueError("Invalid signature")
+    payload = json.loads(_b64decode(payload_b64))
+    if payload.get("exp", 0) <= time.time():
+        raise ValueError("Token expired")
+    return payload
+
+
+def _report(name: str, decode, token: str, iterations: int) -> None:
+    decode(token)  # Fail early if the implementation rejects the token
+    per_call_us = timeit.timeit(lambda: decode(token), number=iterations) / iterations * 1e6
+    print({"implementation": name, "decode_us": round(per_call_us, 3)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare HS256 JWT verification implementations")
+    parser.add_argument("--iterations", type=int, default=50000)
+    args = parser.parse_args()
+
+    token = jose_jwt.encode(
+        {
+            "sub": "user000123",
+            "role": "user",
+            "gen": 0,
+            "exp": datetime.utcnow() + timedelta(minutes=60)
+        },
+        SECRET_KEY,
+        algorithm=ALGORITHM
+    )
+
+    _report("python-jose", lambda t: jose_jwt.decode(t, SECRET_KEY, algorithms=[ALGORITHM]), token, args.iterations)
+
+    if pyjwt is not None:
+        _report("PyJWT", lambda t: pyjwt.decode(t, SECRET_KEY, algorithms=[ALGORITHM]), token, args.iterations)
+    else:
+        print({"implementation": "PyJWT", "skipped": "pip install PyJWT"})
+
+    _report("stdlib hmac (reference)", lambda t: stdlib_decode(t, SECRET_KEY), token, args.iterations)
+
+    # Memoized path used by the auth dependency (same token every call)
+    os.environ.setdefault("SECRET_KEY", SECRET_KEY)
+    import auth
+    if auth.SECRET_KEY == SECRET_KEY:
+        _report("auth.decode_access_token (memo hit)", auth.decode_access_token, token, args.iterations)
+    else:
+        print({"implementation": "auth.decode_access_token", "skipped": "SECRET_KEY already set in environment"})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark: Redis memory usage per session layout
+
+Compares the legacy layout (key "session:<full JWT>", JSON value that
+repeats the token) with the current one (key "session:<token digest>",
+hash without the token).
+
+Writes N sessions per layout under a dedicated prefix, reports the
+INFO used_memory delta and sampled MEMORY USAGE per key, then removes them.
+
+Usage:
+    python benchmarks/bench_session_memory.py --sessions 100000
+"""
+import argparse
+import base64
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from redis_client import redis_client, scan_keys
+from session_manager import get_session_id
+
+
+PREFIX = "bench_session"
+BATCH = 1000
+
+
+def _fake_jwt(user_id: str) -> str:
+    """Build a token with the size and shape of our HS256 access tokens"""
+    def segment(data: dict) -> str:
+        raw = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+    header = segment({"alg": "HS256", "typ": "JWT"})
+    payload = segment({"sub": user_id, "role": "user", "exp": int(time.time()) + 3600})
+    signature = base64.urlsafe_b64encode(random.randbytes(32)).rstrip(b"=").decode("ascii")
+    return f"{header}.{payload}.{signature}"
+
+
+def _session_data(user_id: str) -> dict:
+    now = datetime.utcnow().isoformat()
+    return {
+        "user_id": user_id,
+        "user_name": f"User {user_id}",
+        "email": f"{user_id}@example.com",
+        "role": "user",
+        "ip_address": "10.0.0.1",
+        "created_at": now,
+        "last_activity": now
+    }
+
+
+def _write_legacy(pipe, token: str, data: dict) -> str:
+    key = f"{PREFIX}:legacy:{token}"
+    pipe.setex(key, 3600, json.dumps({**data, "token": token}))
+    return key
+
+
+def _write_hashed(pipe, token: str, data: dict) -> str:
+    key = f"{PREFIX}:hashed:{get_session_id(token)}"
+    pipe.hset(key, mapping=data)
+    pipe.expire(key, 3600)
+    return key
+
+
+def _measure(layout: str, writer, sessions: int, samples: int) -> dict:
+    """Write sessions with one layout and report its memory footprint"""
+    before = redis_client.info("memory")["used_memory"]
+
+    sample_keys = []
+    pipe = redis_client.pipeline(transaction=False)
+    for i in range(sessions):
+        user_id = f"user{i:06d}"
+        key = writer(pipe, _fake_jwt(user_id), _session_data(user_id))
+        if len(sample_keys) < samples:
+            sample_keys.append(key)
+        if (i + 1) % BATCH == 0:
+            pipe.execute()
+    pipe.execute()
+
+    used = redis_client.info("memory")["used_memory"] - before
+    per_key = [redis_client.memory_usage(key, samples=0) or 0 for key in sample_keys]
+
+    _cleanup(f"{PREFIX}:{layout}:*")
+
+    return {
+        "layout": layout,
+        "sessions": sessions,
+        "used_memory_delta_mb": round(used / 1024 / 1024, 2),
+        "avg_memory_usage_bytes": round(sum(per_key) / len(per_key), 1) if per_key else 0
+    }
+
+
+def _cleanup(pattern: str) -> None:
+    batch = []
+    for key in scan_keys(pattern, count=BATCH):
+        batch.append(key)
+        if len(batch) >= BATCH:
+            redis_client.unlink(*batch)
+            batch = []
+    if batch:
+        redis_client.unlink(*batch)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare session memory usage per layout")
+    parser.add_argument("--sessions", type=int, default=100000)
+    parser.add_argument("--samples", type=int, default=1000, help="Keys sampled with MEMORY USAGE")
+    args = parser.parse_args()
+
+    for layout, writer in (("legacy", _write_legacy), ("hashed", _write_hashed)):
+        print(_measure(layout, writer, args.sessions, args.samples))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Benchmark Helpers
+Shared HTTP and statistics helpers for the backend benchmarks
+"""
+import asyncio
+import json
+import os
+import time
+import urllib.request
+from typing import Dict, List, Optional
+
+
+BASE_URL = os.getenv("BENCH_BASE_URL", "http://localhost:8000")
+BENCH_USER = os.getenv("BENCH_USER", "admin")
+BENCH_PASSWORD = os.getenv("BENCH_PASSWORD", "admin123")
+
+
+def request_json(method: str, path: str, body: Optional[dict] = None,
+                 token: Optional[str] = None, base_url: str = BASE_URL) -> dict:
+    """
+    Send a JSON request to the API
+
+    Args:
+        method: HTTP method
+        path: Request path (e.g., "/api/auth/me")
+        body: JSON body (optional)
+        token: Bearer token (optional)
+        base_url: API base URL
+
+    Returns:
+        dict: Decoded JSON response
+    """
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    request = urllib.request.Request(f"{base_url}{path}", data=data, method=method)
+    request.add_header("Content-Type", "application/json")
+    if token:
+        request.add_header("Authorization", f"Bearer {token}")
+
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def login(user_id: str = BENCH_USER, password: str = BENCH_PASSWORD,
+          base_url: str = BASE_URL) -> str:
+    """
+    Log in and return an access token
+
+    Returns:
+        str: JWT access token
+    """
+    response = request_json(
+        "POST", "/api/auth/login",
+        body={"user_id": user_id, "password": password},
+        base_url=base_url
+    )
+    return response["access_token"]
+
+
+def timed(func, *args, **kwargs) -> float:
+    """
+    Run a callable and return its duration in milliseconds
+    """
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return (time.perf_counter() - start) * 1000
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of a list of samples
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """
+    Summarize latency samples in milliseconds
+
+    Returns:
+        dict: count, p50, p99, max
+    """
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+        "max_ms": round(max(samples), 3) if samples else 0.0
+    }
+
+
+async def _keepalive_worker(port: int, path: str, token: Optional[str], deadline: float,
+                            samples: List[float]) -> None:
+    """Send GET requests over one keep-alive connection until the deadline"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    auth_header = f"Authorization: Bearer {token}\r\n" if token else ""
+    request = (
+        f"GET {path} HTTP/1.1\r\n"
+        f"Host: 127.0.0.1\r\n"
+        f"{auth_header}\r\n"
+    ).encode("ascii")
+
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        writer.write(request)
+        await writer.drain()
+
+        content_length = 0
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            if line.lower().startswith(b"content-length:"):
+                content_length = int(line.split(b":")[1])
+        await reader.readexactly(content_length)
+
+        samples.append((time.perf_counter() - start) * 1000)
+
+    writer.close()
+
+
+async def run_load(port: int, path: str, token: Optional[str], concurrency: int, duration: float) -> dict:
+    """
+    Drive a local endpoint with concurrent keep-alive connections
+
+    Args:
+        port: Local server port
+        path: Request path
+        token: Bearer token (optional)
+        concurrency: Number of connections
+        duration: Test length in seconds
+
+    Returns:
+        dict: path, req_per_s and latency summary
+    """
+    samples = []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*[
+        _keepalive_worker(port, path, token, deadline, samples) for _ in range(concurrency)
+    ])
+    return {"path": path, "req_per_s": round(len(samples) / duration, 1), **summarize(samples)}
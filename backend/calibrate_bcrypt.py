@@ -0,0 +1,78 @@
+"""
+bcrypt Cost Calibration
+Measure hash time on this host and suggest BCRYPT_ROUNDS
+
+Run it on (or on hardware like) the production host, ideally while it is
+otherwise idle. The suggestion is the highest cost whose median hash time
+stays within the target; login latency is about one hash, plus one more on
+the first login after a cost change (rehash).
+
+Usage:
+    python calibrate_bcrypt.py --target-ms 250
+"""
+import argparse
+import statistics
+import time
+
+import bcrypt
+
+from password_pool import BCRYPT_ROUNDS, BCRYPT_MIN_ROUNDS, BCRYPT_MAX_ROUNDS, PASSWORD_POOL_WORKERS
+
+
+def measure(rounds: int, samples: int) -> float:
+    """
+    Median time of one bcrypt hash at a cost factor
+
+    Args:
+        rounds: bcrypt cost factor
+        samples: Number of hashes to time
+
+    Returns:
+        float: Median hash time in milliseconds
+    """
+    password = b"calibration-password"
+    timings = []
+    for _ in range(samples):
+        started_at = time.perf_counter()
+        bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+        timings.append((time.perf_counter() - started_at) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure bcrypt hash time and suggest BCRYPT_ROUNDS")
+    parser.add_argument("--target-ms", type=float, default=250, help="Max acceptable hash time (ms)")
+    parser.add_argument("--min-rounds", type=int, default=10)
+    parser.add_argument("--max-rounds", type=int, default=16)
+    parser.add_argument("--samples", type=int, default=3, help="Hashes timed per cost factor")
+    args = parser.parse_args()
+
+    min_rounds = max(args.min_rounds, BCRYPT_MIN_ROUNDS)
+    max_rounds = min(args.max_rounds, BCRYPT_MAX_ROUNDS)
+
+    print(f"⏱️  bcrypt calibration (target {args.target_ms:.0f} ms, current BCRYPT_ROUNDS={BCRYPT_ROUNDS})")
+    print("=" * 60)
+
+    suggested = None
+    for rounds in range(min_rounds, max_rounds + 1):
+        hash_ms = measure(rounds, args.samples)
+        # Each pool worker is one process, so throughput scales with workers
+        per_second = PASSWORD_POOL_WORKERS * 1000 / hash_ms
+        print(f"Rounds: {rounds:2} | Hash: {hash_ms:9.1f} ms | ~{per_second:7.1f} logins/s with {PASSWORD_POOL_WORKERS} workers")
+
+        if hash_ms <= args.target_ms:
+            suggested = rounds
+        else:
+            break  # Every further round doubles the time
+
+    print("=" * 60)
+    if suggested is None:
+        print(f"⚠️  Even {min_rounds} rounds exceed {args.target_ms:.0f} ms; raise the target or lower --min-rounds")
+    else:
+        print(f"✅ Suggested: BCRYPT_ROUNDS={suggested}")
+        if suggested != BCRYPT_ROUNDS:
+            print("   Existing hashes are upgraded on each user's next successful login")
+
+
+if __name__ == "__main__":
+    main()
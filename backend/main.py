@@ -5,16 +5,26 @@ KRX Stock Market - Authentication and Admin API
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
+import asyncio
 from contextlib import asynccontextmanager
 
 # Import routes
 import routes_auth
 import routes_admin
 import routes_session
+import session_cache
+import session_manager
+import session_maintenance
+import session_events
+import session_persistence
+import principal_cache
+import password_pool
+from auth import get_token_cache_stats
 
 # Import database utilities
-from database import init_db, close_db_connections, get_db_info
-from redis_client import check_redis_connection, get_redis_info
+from database import init_db, close_db_connections, close_async_db_connections, get_db_info
+from redis_client import check_redis_connection, get_redis_info, get_pool_stats, get_circuit_state
+from async_redis_client import close_redis_connections, get_pool_stats as get_async_pool_stats
 
 
 # Lifespan context manager for startup and shutdown events
@@ -26,8 +36,15 @@ async def lifespan(app: FastAPI):
     Startup:
         - Initialize database tables
         - Check database connection
+        - Convert sessions stored by older releases
+        - Start session maintenance sweeper
+        - Start session cache invalidation listener
+        - Start session expiry event listener
+        - Start session write-behind persistence
 
     Shutdown:
+        - Stop background tasks (flushing pending session writes)
+        - Close async Redis connections
         - Close database connections
     """
     # Startup
@@ -51,14 +68,38 @@ async def lifespan(app: FastAPI):
     if check_redis_connection():
         redis_info = get_redis_info()
         print(f"✅ Redis connected: {redis_info.get('version')}")
+        # Sessions stored by older releases (JSON strings under the raw JWT)
+        session_manager.migrate_legacy_sessions()
     else:
         print(f"⚠️  Redis connection failed")
 
+    # Start background tasks
+    sweeper_task = asyncio.create_task(session_maintenance.run_periodically())
+    if session_cache.start_invalidation_listener():
+        print("✅ Session cache invalidation listener started")
+    else:
+        print("⚠️  Session cache invalidation listener failed to start")
+    events_task = asyncio.create_task(session_events.run_periodically())
+    if session_events.start_expiry_listener():
+        print("✅ Session expiry event listener started")
+    else:
+        print("⚠️  Session expiry event listener failed to start")
+    persistence_task = asyncio.create_task(session_persistence.run_periodically())
+
     yield
 
     # Shutdown
     print("🛑 Shutting down application...")
+    sweeper_task.cancel()
+    events_task.cancel()
+    session_cache.stop_invalidation_listener()
+    session_events.stop_expiry_listener()
+    persistence_task.cancel()
+    await asyncio.gather(persistence_task, return_exceptions=True)
+    password_pool.shutdown()
+    await close_redis_connections()
     close_db_connections()
+    await close_async_db_connections()
     print("✅ Database connections closed")
 
 
@@ -110,9 +151,11 @@ def health_check():
     """상세 헬스 체크"""
     db_info = get_db_info()
     redis_info = get_redis_info()
+    circuit = get_circuit_state()
+    redis_healthy = redis_info['connected'] and circuit['state'] == "closed"
 
     return {
-        "status": "healthy" if (db_info['connected'] and redis_info['connected']) else "degraded",
+        "status": "healthy" if (db_info['connected'] and redis_healthy) else "degraded",
         "api": "running",
         "database": {
             "connected": db_info['connected'],
@@ -124,8 +167,17 @@ def health_check():
             "connected": redis_info.get('connected'),
             "version": redis_info.get('version'),
             "used_memory": redis_info.get('used_memory'),
-            "connected_clients": redis_info.get('connected_clients')
-        }
+            "connected_clients": redis_info.get('connected_clients'),
+            "circuit_breaker": circuit,
+            "pool": get_pool_stats(),
+            "async_pool": get_async_pool_stats()
+        },
+        "session_maintenance": session_maintenance.get_metrics(),
+        "session_events": session_events.get_metrics(),
+        "session_persistence": session_persistence.get_metrics(),
+        "principal_cache": principal_cache.get_stats(),
+        "token_cache": get_token_cache_stats(),
+        "password_pool": password_pool.get_metrics()
     }
 
 
@@ -27,6 +27,10 @@ class User(Base):
         CheckConstraint("role IN ('user', 'admin', 'super_admin')", name='valid_role'),
     )
 
+    # Fetch SQL-side defaults (updated_at) with RETURNING, so they are loaded
+    # after a flush instead of needing a lazy refresh (not possible under asyncio)
+    __mapper_args__ = {"eager_defaults": True}
+
     def __repr__(self):
         return f"<User(user_id='{self.user_id}', email='{self.email}', role='{self.role}')>"
 
@@ -92,3 +96,40 @@ class AuditLog(Base):
             'ip_address': self.ip_address,
             'user_agent': self.user_agent
         }
+
+
+class SessionRecord(Base):
+    """Session history row (Redis holds the live session, this table the lifecycle)"""
+
+    __tablename__ = "sessions"
+
+    id = Column(String(64), primary_key=True)  # Session ID (digest of the access token)
+    user_id = Column(String(100), ForeignKey('users.user_id', ondelete='CASCADE'), nullable=False, index=True)
+    access_token = Column(Text)
+    refresh_token = Column(Text)
+    created_at = Column(DateTime, default=func.now())
+    expires_at = Column(DateTime, index=True)
+    last_activity = Column(DateTime, default=func.now())
+    ip_address = Column(String(50))
+    user_agent = Column(Text)
+    is_active = Column(Boolean, default=True, index=True)
+    ended_at = Column(DateTime)
+    end_reason = Column(String(20))  # expired, logout, revoked
+
+    def __repr__(self):
+        return f"<SessionRecord(id='{self.id}', user_id='{self.user_id}', is_active={self.is_active})>"
+
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'expires_at': self.expires_at.isoformat() if self.expires_at else None,
+            'last_activity': self.last_activity.isoformat() if self.last_activity else None,
+            'ip_address': self.ip_address,
+            'user_agent': self.user_agent,
+            'is_active': self.is_active,
+            'ended_at': self.ended_at.isoformat() if self.ended_at else None,
+            'end_reason': self.end_reason
+        }
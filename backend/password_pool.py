@@ -0,0 +1,324 @@
+"""
+Password Hashing Pool
+Bounded process pool for bcrypt, isolated from the request workers
+
+bcrypt is deliberately slow and holds a CPU for its whole run. Hashing and
+verification therefore run in a small dedicated process pool: a burst of
+logins (or a credential-stuffing attack) can only occupy those processes,
+never the API's own threads. At most PASSWORD_POOL_MAX_PENDING operations
+may be queued or running; beyond that callers get PasswordPoolFull at once
+so the API can shed load with a 503.
+
+New hashes use BCRYPT_ROUNDS (see calibrate_bcrypt.py to pick it for the
+host). Hashes made with a different cost still verify; needs_rehash()
+tells login to replace them with the current cost.
+
+This module is imported by the pool's child processes, so it must stay
+free of application imports.
+"""
+import asyncio
+import multiprocessing
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, Optional, Tuple
+
+import bcrypt
+
+
+# Pool configuration
+PASSWORD_POOL_WORKERS = int(os.getenv("PASSWORD_POOL_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_POOL_MAX_PENDING = int(os.getenv("PASSWORD_POOL_MAX_PENDING", str(PASSWORD_POOL_WORKERS * 8)))
+PASSWORD_POOL_TIMEOUT = float(os.getenv("PASSWORD_POOL_TIMEOUT", "10"))  # Max wait for a result (seconds)
+
+# bcrypt work factor (log2 of the iteration count); each +1 doubles hash time
+BCRYPT_MIN_ROUNDS = 4
+BCRYPT_MAX_ROUNDS = 31
+BCRYPT_ROUNDS = min(max(int(os.getenv("BCRYPT_ROUNDS", "12")), BCRYPT_MIN_ROUNDS), BCRYPT_MAX_ROUNDS)
+
+_HASH_COST = re.compile(r"^\$2[abxy]?\$(\d{2})\$")
+
+
+class PasswordPoolFull(Exception):
+    """Raised when the hashing queue is full, a result took too long or the pool is restarting"""
+
+
+class PoolMetrics:
+    """Thread-safe counters for queue wait and hash time"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.restarts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_hash = 0.0
+        self.max_hash = 0.0
+
+    def record_submit(self) -> None:
+        with self._lock:
+            self.submitted += 1
+            self.in_flight += 1
+
+    def record_release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def record_reject(self) -> None:
+        with self._lock:
+            self.rejected += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def record_restart(self) -> None:
+        with self._lock:
+            self.restarts += 1
+
+    def record_done(self, wait: float, duration: float) -> None:
+        with self._lock:
+            self.completed += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self.total_hash += duration
+            self.max_hash = max(self.max_hash, duration)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "submitted": self.submitted,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+                "restarts": self.restarts,
+                "avg_queue_wait_ms": round(self.total_wait / self.completed * 1000, 3) if self.completed else 0.0,
+                "max_queue_wait_ms": round(self.max_wait * 1000, 3),
+                "avg_hash_ms": round(self.total_hash / self.completed * 1000, 3) if self.completed else 0.0,
+                "max_hash_ms": round(self.max_hash * 1000, 3)
+            }
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(PASSWORD_POOL_MAX_PENDING)
+metrics = PoolMetrics()
+
+
+# ==================== Worker Functions (run in child processes) ====================
+
+def _hash_worker(password: bytes, rounds: int, submitted_at: float) -> Tuple[bytes, float, float]:
+    started_at = time.time()
+    hashed = bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+    return hashed, started_at - submitted_at, time.time() - started_at
+
+
+def _verify_worker(password: bytes, hashed: bytes, submitted_at: float) -> Tuple[bool, float, float]:
+    started_at = time.time()
+    valid = bcrypt.checkpw(password, hashed)
+    return valid, started_at - submitted_at, time.time() - started_at
+
+
+# ==================== Pool Management ====================
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Create the pool on first use (spawned, so no request-thread state is forked)"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ProcessPoolExecutor(
+                    max_workers=PASSWORD_POOL_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+    return _executor
+
+
+def _discard_executor(executor: ProcessPoolExecutor) -> None:
+    """
+    Drop a broken pool (a worker died, e.g. OOM-killed) so the next
+    operation starts a fresh one
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is not executor:
+            return  # Already replaced by another thread
+        _executor = None
+    metrics.record_restart()
+    print("⚠️  Password hashing pool broke (worker died), restarting it")
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _submit(fn, *args):
+    """
+    Queue an operation, or raise PasswordPoolFull if the queue is full
+
+    A pool found broken at submit time is replaced and the submit retried once.
+
+    Returns:
+        Future: Resolves to (result, queue_wait, hash_time)
+    """
+    if not _slots.acquire(blocking=False):
+        metrics.record_reject()
+        raise PasswordPoolFull("Password hashing queue is full")
+
+    metrics.record_submit()
+
+    try:
+        executor = _get_executor()
+        try:
+            future = executor.submit(fn, *args, time.time())
+        except BrokenProcessPool:
+            _discard_executor(executor)
+            executor = _get_executor()
+            future = executor.submit(fn, *args, time.time())
+    except BrokenProcessPool:
+        _release()
+        _discard_executor(executor)
+        raise PasswordPoolFull("Password hashing pool is restarting")
+    except Exception:
+        _release()
+        raise
+    future.executor = executor  # Lets _result discard the right pool if it breaks
+    future.add_done_callback(lambda _: _release())
+    return future
+
+
+def _release() -> None:
+    metrics.record_release()
+    _slots.release()
+
+
+def _result(future) -> Any:
+    """Wait for an operation's result and record its timings"""
+    try:
+        result, wait, duration = future.result(timeout=PASSWORD_POOL_TIMEOUT)
+    except FutureTimeoutError:
+        metrics.record_timeout()
+        raise PasswordPoolFull("Password hashing timed out")
+    except BrokenProcessPool:
+        _discard_executor(future.executor)
+        raise PasswordPoolFull("Password hashing pool is restarting")
+    metrics.record_done(wait, duration)
+    return result
+
+
+async def _result_async(future) -> Any:
+    """Await an operation's result without blocking the event loop"""
+    try:
+        result, wait, duration = await asyncio.wait_for(
+            asyncio.wrap_future(future), timeout=PASSWORD_POOL_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        metrics.record_timeout()
+        raise PasswordPoolFull("Password hashing timed out")
+    except BrokenProcessPool:
+        _discard_executor(future.executor)
+        raise PasswordPoolFull("Password hashing pool is restarting")
+    metrics.record_done(wait, duration)
+    return result
+
+
+# ==================== Public API ====================
+
+def hash_password(password: str) -> str:
+    """
+    Hash a password with bcrypt in the pool
+
+    Args:
+        password: Plain text password
+
+    Returns:
+        str: bcrypt hash with BCRYPT_ROUNDS cost
+
+    Raises:
+        PasswordPoolFull: Queue is full, the result took too long or the pool is restarting
+    """
+    return _result(_submit(_hash_worker, password.encode("utf-8"), BCRYPT_ROUNDS)).decode("utf-8")
+
+
+async def hash_password_async(password: str) -> str:
+    """Async variant of hash_password"""
+    future = _submit(_hash_worker, password.encode("utf-8"), BCRYPT_ROUNDS)
+    return (await _result_async(future)).decode("utf-8")
+
+
+async def verify_password_async(password: str, hashed_password: str) -> bool:
+    """
+    Check a password against a bcrypt hash in the pool
+
+    Args:
+        password: Plain text password
+        hashed_password: Stored bcrypt hash
+
+    Returns:
+        bool: True if the password matches
+
+    Raises:
+        PasswordPoolFull: Queue is full, the result took too long or the pool is restarting
+    """
+    future = _submit(_verify_worker, password.encode("utf-8"), hashed_password.encode("utf-8"))
+    return await _result_async(future)
+
+
+def get_hash_rounds(hashed_password: str) -> Optional[int]:
+    """
+    Read the cost factor from a bcrypt hash
+
+    Args:
+        hashed_password: Stored bcrypt hash (e.g., "$2b$12$...")
+
+    Returns:
+        int: Cost factor, or None if the hash isn't a bcrypt hash
+    """
+    match = _HASH_COST.match(hashed_password or "")
+    return int(match.group(1)) if match else None
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """
+    Check whether a hash was made with a cost other than BCRYPT_ROUNDS
+
+    Args:
+        hashed_password: Stored bcrypt hash
+
+    Returns:
+        bool: True if it should be replaced after the next successful login
+    """
+    rounds = get_hash_rounds(hashed_password)
+    return rounds is not None and rounds != BCRYPT_ROUNDS
+
+
+def get_metrics() -> Dict[str, Any]:
+    """
+    Get pool gauges and timings
+
+    Returns:
+        dict: Workers, queue depth and limit, bcrypt cost, counters, queue wait and hash times
+    """
+    snapshot = metrics.snapshot()
+    snapshot["workers"] = PASSWORD_POOL_WORKERS
+    snapshot["max_pending"] = PASSWORD_POOL_MAX_PENDING
+    snapshot["bcrypt_rounds"] = BCRYPT_ROUNDS
+    snapshot["started"] = _executor is not None
+    return snapshot
+
+
+def shutdown() -> None:
+    """
+    Stop the worker processes
+    Should be called on application shutdown
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
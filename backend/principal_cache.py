@@ -0,0 +1,139 @@
+"""
+Principal Cache
+Authenticated user records cached so auth skips the per-request users query
+
+Lookups go to the in-process LRU first (a few seconds), then to Redis
+("principal:{user_id}", PRINCIPAL_CACHE_TTL) and only then to Postgres.
+Admin mutations call invalidate(), which deletes the Redis entry and
+broadcasts a user invalidation so every worker drops its copy; login
+stores a fresh record. The password hash is never cached.
+"""
+import os
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import User
+from redis_client import delete_value, hash_tag
+import async_redis_client
+from session_cache import SessionCache
+import session_cache
+
+
+# Principal cache configuration
+PRINCIPAL_PREFIX = "principal"
+PRINCIPAL_CACHE_TTL = int(os.getenv("PRINCIPAL_CACHE_TTL", "300"))  # Redis entry lifetime (seconds)
+PRINCIPAL_L1_TTL = float(os.getenv("PRINCIPAL_CACHE_L1_TTL", "5"))  # In-process lifetime (seconds)
+PRINCIPAL_L1_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_L1_MAX_ENTRIES", "10000"))
+
+PRINCIPAL_FIELDS = ("id", "user_id", "email", "name", "role", "is_active")
+PRINCIPAL_TIME_FIELDS = ("created_at", "updated_at", "last_login")
+
+cache = SessionCache(PRINCIPAL_L1_MAX_ENTRIES, PRINCIPAL_L1_TTL)
+session_cache.register_user_cache(cache)
+
+
+def _get_principal_key(user_id: str) -> str:
+    """
+    Generate Redis key for a cached principal
+
+    Args:
+        user_id: User ID
+
+    Returns:
+        str: Redis key (e.g., "principal:{user01}")
+    """
+    return f"{PRINCIPAL_PREFIX}:{hash_tag(user_id)}"
+
+
+def _to_fields(user: User) -> Dict[str, Any]:
+    """
+    Serializable copy of the user's non-secret columns
+    """
+    fields = {field: getattr(user, field) for field in PRINCIPAL_FIELDS}
+    for field in PRINCIPAL_TIME_FIELDS:
+        value = getattr(user, field)
+        fields[field] = value.isoformat() if value else None
+    return fields
+
+
+def _to_user(fields: Dict[str, Any]) -> User:
+    """
+    Build a detached, read-only User from cached fields
+    """
+    values = {field: fields.get(field) for field in PRINCIPAL_FIELDS}
+    for field in PRINCIPAL_TIME_FIELDS:
+        values[field] = datetime.fromisoformat(fields[field]) if fields.get(field) else None
+    return User(**values)
+
+
+async def store_principal_async(user: User) -> None:
+    """
+    Cache a user's record in Redis and in this worker's memory
+
+    Args:
+        user: User loaded from the database
+    """
+    key = _get_principal_key(user.user_id)
+    fields = _to_fields(user)
+    await async_redis_client.set_value(key, fields, expire=PRINCIPAL_CACHE_TTL)
+    cache.set(key, fields)
+
+
+async def load_user_async(user_id: str, db: AsyncSession) -> Optional[User]:
+    """
+    Get the user for an authenticated request, from cache when possible
+
+    Tries this worker's memory, then Redis, then the database. The returned
+    object is detached when it comes from the cache, so it must only be
+    read; load the user from `db` to modify it.
+
+    Args:
+        user_id: User ID
+        db: Async database session used on a cache miss
+
+    Returns:
+        User: The user, or None if it doesn't exist
+    """
+    key = _get_principal_key(user_id)
+
+    fields = cache.get(key)
+    if fields is None:
+        fields = await async_redis_client.get_value(key)
+        if isinstance(fields, dict):
+            cache.set(key, fields)
+        else:
+            fields = None
+
+    if fields is not None:
+        return _to_user(fields)
+
+    user = (await db.execute(select(User).where(User.user_id == user_id))).scalar_one_or_none()
+    if user is not None:
+        await store_principal_async(user)
+    return user
+
+
+def invalidate(user_id: str) -> None:
+    """
+    Drop a user's cached principal everywhere
+
+    Call after committing any change to the user's row.
+
+    Args:
+        user_id: User ID
+    """
+    delete_value(_get_principal_key(user_id))
+    session_cache.invalidate_user(user_id)
+
+
+def get_stats() -> Dict[str, Any]:
+    """
+    Get in-process cache counters
+
+    Returns:
+        dict: L1 size and hit/miss counters
+    """
+    return cache.stats()
@@ -0,0 +1,330 @@
+"""
+Rate Limiter
+Redis sliding-window limits for the auth endpoints
+
+Each (route, scope, identifier) has a sorted set of request timestamps.
+One Lua script drops timestamps older than the window, counts the rest and
+records the new request only if it fits, so the check is atomic across
+workers and costs a single round trip. Timestamps come from the Redis
+server's clock, so app servers with skewed clocks still share one window.
+Per-IP limits are checked before any database query, per-account limits
+(keyed by the resolved account) before any bcrypt work.
+
+The client IP is the TCP peer address. X-Forwarded-For is only honoured
+when the peer is a proxy listed in RATE_LIMIT_TRUSTED_PROXIES, otherwise
+a client could pick a fresh "IP" for every request. Server-side frontends
+(the Streamlit app) call the API on behalf of many users; when the peer is
+listed in RATE_LIMIT_TRUSTED_FRONTENDS, the end-user IP is taken from its
+X-End-User-IP header instead, and a request without one gets no per-IP
+limit rather than sharing a single bucket with every other user.
+
+Limits are "<requests>/<seconds>" strings, configurable per route and
+scope with RATE_LIMIT_<ROUTE>_<SCOPE> (e.g., RATE_LIMIT_LOGIN_IP=20/60).
+If Redis is unavailable, requests are allowed (fail open).
+"""
+import asyncio
+import ipaddress
+import math
+import os
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple, Union
+
+from fastapi import HTTPException, Request, status
+
+import async_redis_client
+
+
+IPNetwork = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+# Rate limit configuration
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_PREFIX = "ratelimit"
+
+# Proxies whose X-Forwarded-For is trusted (comma-separated IPs or CIDRs)
+RATE_LIMIT_TRUSTED_PROXIES = [
+    ipaddress.ip_network(entry.strip(), strict=False)
+    for entry in os.getenv("RATE_LIMIT_TRUSTED_PROXIES", "").split(",")
+    if entry.strip()
+]
+
+# Server-side frontends whose X-End-User-IP is trusted (comma-separated IPs,
+# CIDRs or hostnames; hostnames are re-resolved every FRONTEND_RESOLVE_INTERVAL)
+RATE_LIMIT_TRUSTED_FRONTENDS = [
+    entry.strip()
+    for entry in os.getenv("RATE_LIMIT_TRUSTED_FRONTENDS", "").split(",")
+    if entry.strip()
+]
+FRONTEND_RESOLVE_INTERVAL = 60  # seconds
+END_USER_IP_HEADER = "X-End-User-IP"
+
+# Default limits per (route, scope); override with RATE_LIMIT_<ROUTE>_<SCOPE>
+DEFAULT_LIMITS: Dict[Tuple[str, str], str] = {
+    ("login", "ip"): "20/60",
+    ("login", "user"): "10/300",
+    ("register", "ip"): "5/3600",
+}
+
+
+# Sliding-window log check-and-record.
+# KEYS[1] = window sorted set
+# ARGV[1] = window (ms), ARGV[2] = limit, ARGV[3] = unique member
+# Returns {allowed (1/0), requests in window, retry after (ms)}
+_SLIDING_WINDOW_LUA = """
+local server_time = redis.call('TIME')
+local now = tonumber(server_time[1]) * 1000 + math.floor(tonumber(server_time[2]) / 1000)
+local window = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+local count = redis.call('ZCARD', KEYS[1])
+if count >= limit then
+    local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+    local retry_after = window
+    if #oldest > 0 then
+        retry_after = tonumber(oldest[2]) + window - now
+    end
+    return {0, count, retry_after}
+end
+
+redis.call('ZADD', KEYS[1], now, ARGV[3])
+redis.call('PEXPIRE', KEYS[1], window)
+return {1, count + 1, 0}
+"""
+
+_sliding_window_script_async = async_redis_client.register_script(_SLIDING_WINDOW_LUA)
+
+
+def parse_limit(value: str) -> Tuple[int, float]:
+    """
+    Parse a "<requests>/<seconds>" limit
+
+    Args:
+        value: Limit string (e.g., "20/60")
+
+    Returns:
+        tuple: (max requests, window in seconds)
+    """
+    requests, seconds = value.split("/", 1)
+    return int(requests), float(seconds)
+
+
+def get_limit(route: str, scope: str) -> Optional[Tuple[int, float]]:
+    """
+    Get the configured limit for a route and scope
+
+    Args:
+        route: Route name (e.g., "login")
+        scope: Key scope ("ip" or "user")
+
+    Returns:
+        tuple: (max requests, window in seconds), or None if unlimited
+    """
+    value = os.getenv(f"RATE_LIMIT_{route.upper()}_{scope.upper()}", DEFAULT_LIMITS.get((route, scope)))
+    if not value or value.lower() in ("0", "off", "none"):
+        return None
+    return parse_limit(value)
+
+
+def _get_limit_key(route: str, scope: str, identifier: str) -> str:
+    """
+    Generate Redis key for a rate limit window
+
+    Returns:
+        str: Redis key (e.g., "ratelimit:login:ip:10.0.0.1")
+    """
+    return f"{RATE_LIMIT_PREFIX}:{route}:{scope}:{identifier}"
+
+
+def _script_args(route: str, scope: str, identifier: Optional[str]) -> Optional[Tuple[list, list]]:
+    """
+    Keys and arguments for the window script, or None if no limit applies
+    """
+    limit = get_limit(route, scope)
+    if not RATE_LIMIT_ENABLED or limit is None or not identifier:
+        return None
+
+    max_requests, window = limit
+    return (
+        [_get_limit_key(route, scope, identifier)],
+        [int(window * 1000), max_requests, uuid.uuid4().hex]
+    )
+
+
+def _parse_result(result) -> Tuple[bool, float]:
+    """
+    (allowed, retry after in seconds) from the script result
+    """
+    if not result:
+        return True, 0.0  # Fail open when Redis is unavailable
+
+    allowed, _, retry_after_ms = result
+    return bool(allowed), retry_after_ms / 1000
+
+
+async def check_async(route: str, scope: str, identifier: Optional[str]) -> Tuple[bool, float]:
+    """
+    Record a request and check it against its limit
+
+    Args:
+        route: Route name
+        scope: Key scope ("ip" or "user")
+        identifier: Client IP or resolved account ID (no limit applied if empty)
+
+    Returns:
+        tuple: (allowed, seconds until a slot frees up)
+    """
+    script_args = _script_args(route, scope, identifier)
+    if script_args is None:
+        return True, 0.0
+
+    keys, args = script_args
+    return _parse_result(
+        await async_redis_client.run_script(_sliding_window_script_async, keys=keys, args=args)
+    )
+
+
+def _reject(route: str, scope: str, identifier: Optional[str], retry_after: float) -> None:
+    """
+    Raise the 429 for a request over its limit
+    """
+    print(f"🚦 Rate limit exceeded for {route} ({scope}: {identifier})")
+    raise HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many requests, please try again later",
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+async def enforce_async(route: str, scope: str, identifier: Optional[str]) -> None:
+    """
+    Raise 429 if the request exceeds its limit
+
+    Args:
+        route: Route name
+        scope: Key scope ("ip" or "user")
+        identifier: Client IP or resolved account ID
+
+    Raises:
+        HTTPException: 429 with Retry-After when the limit is exceeded
+    """
+    allowed, retry_after = await check_async(route, scope, identifier)
+    if not allowed:
+        _reject(route, scope, identifier, retry_after)
+
+
+_frontend_networks: List[IPNetwork] = []
+_frontends_resolved_at: Optional[float] = None
+
+
+def _in_networks(address: str, networks: List[IPNetwork]) -> bool:
+    """
+    Check whether an address falls in any of the given networks
+    """
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
+
+
+def _is_trusted_proxy(address: str) -> bool:
+    """
+    Check whether an address is a configured trusted proxy
+    """
+    return _in_networks(address, RATE_LIMIT_TRUSTED_PROXIES)
+
+
+async def _get_frontend_networks() -> List[IPNetwork]:
+    """
+    Networks of the trusted frontends, with hostnames resolved
+
+    Container addresses change on restart, so hostnames are looked up
+    again once the cached result is FRONTEND_RESOLVE_INTERVAL old.
+    """
+    global _frontend_networks, _frontends_resolved_at
+
+    now = time.monotonic()
+    if _frontends_resolved_at is not None and now - _frontends_resolved_at < FRONTEND_RESOLVE_INTERVAL:
+        return _frontend_networks
+
+    loop = asyncio.get_running_loop()
+    networks = []
+    for entry in RATE_LIMIT_TRUSTED_FRONTENDS:
+        try:
+            networks.append(ipaddress.ip_network(entry, strict=False))
+            continue
+        except ValueError:
+            pass
+        try:
+            addresses = {info[4][0] for info in await loop.getaddrinfo(entry, None)}
+        except OSError as e:
+            print(f"⚠️  Could not resolve trusted frontend {entry}: {e}")
+            continue
+        networks.extend(ipaddress.ip_network(address) for address in addresses)
+
+    _frontend_networks = networks
+    _frontends_resolved_at = now
+    return networks
+
+
+async def get_rate_limit_ip(request: Request) -> Optional[str]:
+    """
+    Client IP to rate limit on
+
+    The TCP peer, with two exceptions. A trusted frontend's requests are
+    keyed by its X-End-User-IP header (None, so no per-IP limit, if the
+    header is missing or invalid). For a trusted proxy, X-Forwarded-For is
+    walked from the right (the entries our proxies appended) to the first
+    address that isn't a trusted proxy; entries left of that are client
+    supplied and ignored.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        str: Client IP, or None if unknown
+    """
+    peer = request.client.host if request.client else None
+    if not peer:
+        return None
+
+    if RATE_LIMIT_TRUSTED_FRONTENDS and _in_networks(peer, await _get_frontend_networks()):
+        end_user_ip = (request.headers.get(END_USER_IP_HEADER) or "").strip()
+        try:
+            return str(ipaddress.ip_address(end_user_ip))
+        except ValueError:
+            return None
+
+    if not _is_trusted_proxy(peer):
+        return peer
+
+    forwarded: List[str] = [
+        entry.strip()
+        for header in request.headers.getlist("x-forwarded-for")
+        for entry in header.split(",")
+        if entry.strip()
+    ]
+    for address in reversed(forwarded):
+        if not _is_trusted_proxy(address):
+            return address
+    return peer
+
+
+def limit_by_ip(route: str):
+    """
+    Build a dependency enforcing a route's per-IP limit
+
+    The check is awaited on the event loop, so throttled requests never
+    reach the threadpool.
+
+    Args:
+        route: Route name (selects RATE_LIMIT_<ROUTE>_IP)
+
+    Returns:
+        Callable: FastAPI dependency
+    """
+    async def dependency(request: Request) -> None:
+        await enforce_async(route, "ip", await get_rate_limit_ip(request))
+
+    return dependency
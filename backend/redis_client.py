@@ -1,31 +1,391 @@
 """
 Redis Client Configuration
 Handles Redis connection and basic operations
+
+Runs against a single Redis server by default, or against a Redis Cluster
+when REDIS_CLUSTER_NODES is set. Every connection goes through a circuit
+breaker, so an unreachable Redis costs callers microseconds, not
+timeouts. Helpers that touch several keys or walk the keyspace work in
+both modes; keys that must be used together in one script carry a shared
+hash tag (see hash_tag).
 """
 import redis
-import json
+from redis.cluster import RedisCluster, ClusterNode
 import os
-from typing import Optional, Any
-from datetime import timedelta
+import threading
+import time
+from typing import Optional, Any, Iterator, Tuple, List
+from urllib.parse import urlparse
+
+import serialization
 
 
 # Redis connection configuration
+# REDIS_URL (e.g., "redis://:password@redis:6379/0") takes precedence over the individual settings
+REDIS_URL = os.getenv("REDIS_URL")
 REDIS_HOST = os.getenv("REDIS_HOST", "redis")
 REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
 REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", "redis123")
 REDIS_DB = int(os.getenv("REDIS_DB", "0"))
+REDIS_TLS = bool(REDIS_URL) and urlparse(REDIS_URL).scheme == "rediss"
+# Comma-separated cluster startup nodes (e.g., "redis-1:7000,redis-2:7001"); enables cluster mode
+REDIS_CLUSTER_NODES = os.getenv("REDIS_CLUSTER_NODES", "")
+CLUSTER_MODE = bool(REDIS_CLUSTER_NODES.strip())
+
+# Connection pool configuration
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", "2"))  # Max wait for a free connection (seconds)
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "2"))
+REDIS_SOCKET_CONNECT_TIMEOUT = float(os.getenv("REDIS_SOCKET_CONNECT_TIMEOUT", "1"))
+
+# Circuit breaker configuration
+REDIS_BREAKER_FAILURE_THRESHOLD = int(os.getenv("REDIS_BREAKER_FAILURE_THRESHOLD", "5"))  # Consecutive failures
+REDIS_BREAKER_RESET_TIMEOUT = float(os.getenv("REDIS_BREAKER_RESET_TIMEOUT", "10"))  # seconds before probing
+
+# scan_page cursors pack the node index below this bound in cluster mode
+_MAX_CLUSTER_NODES = 1024
+
+
+def _connection_kwargs() -> dict:
+    """
+    Per-connection settings shared by single-server and cluster clients
+    """
+    return {
+        "max_connections": REDIS_MAX_CONNECTIONS,
+        "socket_timeout": REDIS_SOCKET_TIMEOUT,
+        "socket_connect_timeout": REDIS_SOCKET_CONNECT_TIMEOUT,
+        "socket_keepalive": True,
+        "health_check_interval": 30,
+        "decode_responses": True  # Automatically decode byte responses to strings
+    }
+
+
+def get_pool_kwargs() -> dict:
+    """
+    Connection pool settings shared by the sync and async clients
+
+    Returns:
+        dict: Keyword arguments for a (Blocking)ConnectionPool
+    """
+    kwargs = _connection_kwargs()
+    kwargs["timeout"] = REDIS_POOL_TIMEOUT
+    if not REDIS_URL:
+        kwargs.update({
+            "host": REDIS_HOST,
+            "port": REDIS_PORT,
+            "password": REDIS_PASSWORD,
+            "db": REDIS_DB
+        })
+    return kwargs
+
+
+def get_cluster_kwargs() -> dict:
+    """
+    Client settings shared by the sync and async cluster clients
+
+    Cluster nodes come from REDIS_CLUSTER_NODES, and a cluster has no
+    database index, so host, port and db are never included.
+
+    Returns:
+        dict: Keyword arguments for a RedisCluster
+    """
+    kwargs = _connection_kwargs()
+    kwargs["password"] = REDIS_PASSWORD
+    return kwargs
+
+
+class PoolMetrics:
+    """Thread-safe counters for connection acquisition"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.acquires = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_acquire(self, wait: float) -> None:
+        with self._lock:
+            self.acquires += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self, in_use: int, idle: int, max_connections: int) -> dict:
+        with self._lock:
+            return {
+                "in_use": in_use,
+                "idle": idle,
+                "max_connections": max_connections,
+                "acquires": self.acquires,
+                "acquire_timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait / self.acquires * 1000, 3) if self.acquires else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3)
+            }
+
+
+class CircuitOpenError(redis.ConnectionError):
+    """Raised without touching the network while the Redis circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker for Redis connections
+
+    closed: commands run normally; consecutive connection failures are counted.
+    open: after REDIS_BREAKER_FAILURE_THRESHOLD failures, commands fail
+        immediately with CircuitOpenError for REDIS_BREAKER_RESET_TIMEOUT seconds.
+    half_open: once the timeout has passed, a single connection may probe
+        (all of its commands, including AUTH on connect, go through);
+        success closes the circuit, failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self._lock = threading.Lock()
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started = 0.0
+        self.probe_owner = None
+        self.trips = 0
+        self.rejected = 0
+        self.last_error = None
+
+    def is_open(self) -> bool:
+        """True while commands are being rejected without probing"""
+        if self.state != self.OPEN:
+            return False
+        return time.monotonic() - self.opened_at < self.reset_timeout
+
+    def allow(self, owner: Any = None) -> bool:
+        """Decide whether `owner` (a connection) may send (may start a half-open probe)"""
+        if self.state == self.CLOSED:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if now - self.opened_at < self.reset_timeout:
+                    self.rejected += 1
+                    return False
+                self.state = self.HALF_OPEN
+            elif self.probe_owner is not owner and now - self.probe_started < self.reset_timeout:
+                # Only the probing connection may talk, unless it never reported back
+                self.rejected += 1
+                return False
+            self.probe_owner = owner
+            self.probe_started = now
+            return True
+
+    def record_success(self) -> None:
+        if self.state == self.CLOSED and self.failures == 0:
+            return
+        with self._lock:
+            if self.state != self.CLOSED:
+                print("✅ Redis circuit closed: Redis is reachable again")
+            self.state = self.CLOSED
+            self.failures = 0
+            self.probe_owner = None
+
+    def record_failure(self, error: Exception) -> None:
+        with self._lock:
+            self.failures += 1
+            self.last_error = str(error)
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self.failures >= self.failure_threshold
+            ):
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self.probe_owner = None
+                self.trips += 1
+                print(f"⚠️  Redis circuit opened after {self.failures} failures: {error}")
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            state = self.state
+            if state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                state = self.HALF_OPEN  # Next command will probe
+            return {
+                "state": state,
+                "consecutive_failures": self.failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout": self.reset_timeout,
+                "trips": self.trips,
+                "rejected": self.rejected,
+                "last_error": self.last_error
+            }
+
+
+circuit_breaker = CircuitBreaker(REDIS_BREAKER_FAILURE_THRESHOLD, REDIS_BREAKER_RESET_TIMEOUT)
+
+
+class BreakerConnection(redis.Connection):
+    """
+    Connection that reports to the circuit breaker and fails fast while it is open
+    """
+
+    def connect(self):
+        if circuit_breaker.is_open():
+            raise CircuitOpenError("Redis circuit is open")
+        try:
+            super().connect()
+        except (redis.ConnectionError, redis.TimeoutError) as e:
+            circuit_breaker.record_failure(e)
+            raise
+
+    def send_packed_command(self, command, check_health=True):
+        if not circuit_breaker.allow(self):
+            raise CircuitOpenError("Redis circuit is open")
+        try:
+            super().send_packed_command(command, check_health)
+        except CircuitOpenError:
+            raise
+        except (redis.ConnectionError, redis.TimeoutError) as e:
+            circuit_breaker.record_failure(e)
+            raise
+
+    def read_response(self, *args, **kwargs):
+        try:
+            response = super().read_response(*args, **kwargs)
+        except (redis.ConnectionError, redis.TimeoutError) as e:
+            circuit_breaker.record_failure(e)
+            raise
+        except redis.RedisError:
+            # The server answered (e.g., with a script error), so it is reachable
+            circuit_breaker.record_success()
+            raise
+        circuit_breaker.record_success()
+        return response
+
+
+class BreakerSSLConnection(BreakerConnection, redis.SSLConnection):
+    """
+    BreakerConnection over TLS, for rediss:// URLs
+    """
+
+
+class InstrumentedConnectionPool(redis.BlockingConnectionPool):
+    """
+    Blocking pool with a hard connection limit and acquisition metrics
+
+    When every connection is busy, callers wait up to REDIS_POOL_TIMEOUT
+    seconds and then fail with a ConnectionError instead of opening more.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.metrics = PoolMetrics()
+        super().__init__(*args, **kwargs)
+
+    def get_connection(self, command_name, *keys, **options):
+        start = time.perf_counter()
+        try:
+            connection = super().get_connection(command_name, *keys, **options)
+        except redis.ConnectionError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record_acquire(time.perf_counter() - start)
+        return connection
+
+    def get_stats(self) -> dict:
+        idle = sum(1 for connection in list(self.pool.queue) if connection is not None)
+        return self.metrics.snapshot(
+            in_use=len(self._connections) - idle,
+            idle=idle,
+            max_connections=self.max_connections
+        )
+
+
+def get_cluster_nodes() -> List[ClusterNode]:
+    """
+    Parse REDIS_CLUSTER_NODES into cluster startup nodes
+
+    Returns:
+        list: ClusterNode for each "host:port" entry
+    """
+    nodes = []
+    for entry in REDIS_CLUSTER_NODES.split(","):
+        if entry.strip():
+            host, _, port = entry.strip().rpartition(":")
+            nodes.append(ClusterNode(host, int(port)))
+    return nodes
+
+
+# Create connection pool and Redis client
+if CLUSTER_MODE:
+    # Each node gets its own (non-blocking) pool; max_connections applies per node
+    connection_pool = None
+    redis_client = RedisCluster(
+        startup_nodes=get_cluster_nodes(),
+        connection_class=BreakerConnection,
+        **get_cluster_kwargs()
+    )
+else:
+    if REDIS_URL:
+        # An explicit connection_class replaces the SSLConnection redis-py
+        # would pick for rediss://, so the TLS variant is chosen here
+        connection_pool = InstrumentedConnectionPool.from_url(
+            REDIS_URL,
+            connection_class=BreakerSSLConnection if REDIS_TLS else BreakerConnection,
+            **get_pool_kwargs()
+        )
+    else:
+        connection_pool = InstrumentedConnectionPool(
+            connection_class=BreakerConnection, **get_pool_kwargs()
+        )
+
+    redis_client = redis.Redis(connection_pool=connection_pool)
+
+
+def is_unavailable_error(error: Exception) -> bool:
+    """
+    Check whether an exception means Redis could not be reached
+
+    Args:
+        error: Exception raised by a Redis call
+
+    Returns:
+        bool: True for connection errors, timeouts and an open circuit
+    """
+    return isinstance(error, (redis.ConnectionError, redis.TimeoutError))
 
-# Create Redis client
-redis_client = redis.Redis(
-    host=REDIS_HOST,
-    port=REDIS_PORT,
-    password=REDIS_PASSWORD,
-    db=REDIS_DB,
-    decode_responses=True,  # Automatically decode byte responses to strings
-    socket_connect_timeout=5,
-    socket_keepalive=True,
-    health_check_interval=30
-)
+
+def hash_tag(value: str) -> str:
+    """
+    Wrap a value in a cluster hash tag
+
+    Keys sharing the same tag map to the same cluster slot, so they can be
+    used together in one Lua script or multi-key command.
+
+    Args:
+        value: Tag value (e.g., a user ID)
+
+    Returns:
+        str: Tag (e.g., "{user01}")
+    """
+    return f"{{{value}}}"
+
+
+def node_clients() -> list:
+    """
+    Get one client per primary node
+
+    Returns:
+        list: [redis_client] on a single server, a client per primary in cluster mode
+    """
+    if not CLUSTER_MODE:
+        return [redis_client]
+    primaries = sorted(redis_client.get_primaries(), key=lambda node: node.name)
+    return [node.redis_connection for node in primaries]
 
 
 def check_redis_connection() -> bool:
@@ -49,7 +409,7 @@ def set_value(key: str, value: Any, expire: Optional[int] = None) -> bool:
 
     Args:
         key: Redis key
-        value: Value to store (will be JSON serialized if not string)
+        value: Value to store (encoded with the default codec if not a string)
         expire: Expiration time in seconds (optional)
 
     Returns:
@@ -58,7 +418,7 @@ def set_value(key: str, value: Any, expire: Optional[int] = None) -> bool:
     try:
         # Serialize value if it's not a string
         if not isinstance(value, str):
-            value = json.dumps(value)
+            value = serialization.encode(value)
 
         if expire:
             redis_client.setex(key, expire, value)
@@ -77,7 +437,7 @@ def get_value(key: str, deserialize: bool = True) -> Optional[Any]:
 
     Args:
         key: Redis key
-        deserialize: Whether to JSON deserialize the value
+        deserialize: Whether to decode the value (tagged codec or legacy JSON)
 
     Returns:
         The value or None if not found
@@ -88,12 +448,9 @@ def get_value(key: str, deserialize: bool = True) -> Optional[Any]:
         if value is None:
             return None
 
-        # Try to deserialize JSON if requested
+        # Decode tagged payloads; untagged values fall back to legacy JSON
         if deserialize:
-            try:
-                return json.loads(value)
-            except (json.JSONDecodeError, TypeError):
-                return value
+            return serialization.decode(value)
 
         return value
     except Exception as e:
@@ -175,43 +532,372 @@ def extend_expiry(key: str, additional_seconds: int) -> bool:
         return False
 
 
+def pipeline():
+    """
+    Create a non-transactional pipeline for batching commands
+
+    Returns:
+        Pipeline: Redis pipeline (call execute() to send the batch)
+    """
+    return redis_client.pipeline(transaction=False)
+
+
+def get_many(keys: list) -> list:
+    """
+    Get raw values for several keys in a single MGET
+
+    Args:
+        keys: Redis keys
+
+    Returns:
+        list: Values in the same order as keys (None for missing keys)
+    """
+    if not keys:
+        return []
+    try:
+        if CLUSTER_MODE:
+            # Split per slot and reassembled in order
+            return redis_client.mget_nonatomic(keys)
+        return redis_client.mget(keys)
+    except Exception as e:
+        print(f"❌ Redis mget failed for {len(keys)} keys: {e}")
+        return [None] * len(keys)
+
+
+def get_sorted_members(key: str, desc: bool = True) -> list:
+    """
+    Get all members of a sorted set
+
+    Args:
+        key: Redis sorted set key
+        desc: Return members by descending score (default: True)
+
+    Returns:
+        list: Sorted set members
+    """
+    try:
+        if desc:
+            return redis_client.zrevrange(key, 0, -1)
+        return redis_client.zrange(key, 0, -1)
+    except Exception as e:
+        print(f"❌ Redis sorted set read failed for key '{key}': {e}")
+        return []
+
+
+def register_script(source: str):
+    """
+    Register a Lua script with the Redis client
+
+    The returned script object runs via EVALSHA and transparently
+    falls back to loading the script when the server doesn't have it cached.
+    In cluster mode the script is also loaded on every primary up front,
+    because cluster pipelines cannot fall back on NOSCRIPT.
+
+    Args:
+        source: Lua script source
+
+    Returns:
+        Script: Callable Redis script object
+    """
+    script = redis_client.register_script(source)
+    if CLUSTER_MODE:
+        try:
+            redis_client.script_load(source)
+        except Exception as e:
+            print(f"⚠️  Redis script preload failed: {e}")
+    return script
+
+
+def run_script(script, keys: list, args: list, client=None,
+               raise_unavailable: bool = False) -> Optional[Any]:
+    """
+    Execute a registered Lua script in a single round trip
+
+    Args:
+        script: Script object returned by register_script
+        keys: Redis keys the script touches (KEYS)
+        args: Additional script arguments (ARGV)
+        client: Pipeline to queue the call on instead of running it now (optional)
+        raise_unavailable: Re-raise connection errors and timeouts (including an
+            open circuit) instead of returning None, so callers can tell
+            "Redis is down" from "no result"
+
+    Returns:
+        The script result (or the pipeline when queued), None if execution failed
+    """
+    try:
+        return script(keys=keys, args=args, client=client)
+    except Exception as e:
+        if raise_unavailable and is_unavailable_error(e):
+            raise
+        print(f"❌ Redis script failed for keys {keys}: {e}")
+        return None
+
+
 def get_keys_by_pattern(pattern: str) -> list:
     """
     Get all keys matching a pattern
 
+    Collected with SCAN (on every primary in cluster mode), so the server
+    is never blocked; prefer scan_keys to avoid holding the whole list.
+
     Args:
         pattern: Redis key pattern (e.g., "session:*")
 
     Returns:
         list: List of matching keys
     """
+    return list(dict.fromkeys(scan_keys(pattern)))
+
+
+def scan_keys(pattern: str, count: int = 500) -> Iterator[str]:
+    """
+    Incrementally iterate keys matching a pattern using SCAN
+
+    Unlike KEYS, SCAN never blocks the server for the whole keyspace;
+    each step only walks a small slice of it. In cluster mode every
+    primary is scanned in turn.
+
+    Args:
+        pattern: Redis key pattern (e.g., "session:*")
+        count: Hint for how many keys each SCAN step examines
+
+    Yields:
+        str: Matching keys (a key may occasionally be yielded twice)
+    """
     try:
-        return redis_client.keys(pattern)
+        yield from redis_client.scan_iter(match=pattern, count=count)
     except Exception as e:
-        print(f"❌ Redis keys search failed for pattern '{pattern}': {e}")
-        return []
+        print(f"❌ Redis scan failed for pattern '{pattern}': {e}")
+
+
+def scan_page(pattern: str, cursor: int = 0, count: int = 100) -> Tuple[int, list]:
+    """
+    Run a single SCAN step for cursor-based pagination
+
+    In cluster mode the cursor packs the primary being scanned (ordered by
+    node name) with that node's own SCAN cursor, so callers keep passing a
+    single integer back.
 
+    Args:
+        pattern: Redis key pattern (e.g., "session:*")
+        cursor: Cursor returned by the previous page (0 to start)
+        count: Hint for how many keys the step examines
 
-def delete_by_pattern(pattern: str) -> int:
+    Returns:
+        tuple: (next_cursor, keys) - next_cursor is 0 when iteration is complete
+    """
+    try:
+        if not CLUSTER_MODE:
+            next_cursor, keys = redis_client.scan(cursor=cursor, match=pattern, count=count)
+            return int(next_cursor), keys
+
+        clients = node_clients()
+        node_cursor, node_index = divmod(int(cursor), _MAX_CLUSTER_NODES)
+        if node_index >= len(clients):
+            return 0, []
+
+        node_cursor, keys = clients[node_index].scan(cursor=node_cursor, match=pattern, count=count)
+        if int(node_cursor) == 0:
+            node_index += 1
+            if node_index >= len(clients):
+                return 0, keys
+        return int(node_cursor) * _MAX_CLUSTER_NODES + node_index, keys
+    except Exception as e:
+        print(f"❌ Redis scan failed for pattern '{pattern}': {e}")
+        return 0, []
+
+
+def _unlink_keys(keys: list) -> int:
+    """
+    UNLINK keys one per command in a single pipeline
+    """
+    if not keys:
+        return 0
+    pipe = pipeline()
+    for key in keys:
+        pipe.unlink(key)
+    return sum(pipe.execute())
+
+
+def delete_by_pattern(pattern: str, batch_size: int = 500) -> int:
     """
     Delete all keys matching a pattern
 
+    Keys are found with SCAN and removed with pipelined single-key UNLINKs,
+    so no command spans several cluster slots.
+
     Args:
         pattern: Redis key pattern (e.g., "session:*")
+        batch_size: Keys per pipelined round trip
 
     Returns:
         int: Number of keys deleted
     """
     try:
-        keys = redis_client.keys(pattern)
-        if keys:
-            return redis_client.delete(*keys)
-        return 0
+        deleted = 0
+        batch = []
+        for key in scan_keys(pattern, count=batch_size):
+            batch.append(key)
+            if len(batch) >= batch_size:
+                deleted += _unlink_keys(batch)
+                batch = []
+        return deleted + _unlink_keys(batch)
     except Exception as e:
         print(f"❌ Redis pattern delete failed for pattern '{pattern}': {e}")
         return 0
 
 
+def publish(channel: str, message: str) -> int:
+    """
+    Publish a message on a pub/sub channel
+
+    Args:
+        channel: Channel name
+        message: Message payload
+
+    Returns:
+        int: Number of subscribers that received the message (0 on failure)
+    """
+    try:
+        return redis_client.publish(channel, message)
+    except Exception as e:
+        print(f"❌ Redis publish failed for channel '{channel}': {e}")
+        return 0
+
+
+def _handle_listener_error(error: Exception, pubsub, thread) -> None:
+    """
+    Keep pub/sub listener threads alive through Redis outages
+
+    The pubsub reconnects and resubscribes on its next read once Redis
+    (and the circuit) is back.
+    """
+    print(f"⚠️  Redis listener error: {error}")
+    time.sleep(1.0)
+
+
+def subscribe(channel: str, handler):
+    """
+    Subscribe to a pub/sub channel on a background thread
+
+    Args:
+        channel: Channel name
+        handler: Callable receiving each message dict (message["data"] is the payload)
+
+    Returns:
+        PubSubWorkerThread: Running listener thread (call stop() to end it), None on failure
+    """
+    try:
+        # PUBLISH reaches every cluster node, so any one node will do
+        pubsub = node_clients()[0].pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{channel: handler})
+        return pubsub.run_in_thread(
+            sleep_time=1.0, daemon=True, exception_handler=_handle_listener_error
+        )
+    except Exception as e:
+        print(f"❌ Redis subscribe failed for channel '{channel}': {e}")
+        return None
+
+
+def subscribe_all_nodes(channel: str, handler) -> list:
+    """
+    Subscribe to a node-local channel on every primary
+
+    Keyspace notifications are only published on the node that owns the
+    key, so in cluster mode each primary needs its own listener.
+
+    Args:
+        channel: Channel name
+        handler: Callable receiving each message dict
+
+    Returns:
+        list: Running listener threads (empty on failure)
+    """
+    threads = []
+    try:
+        for client in node_clients():
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{channel: handler})
+            threads.append(pubsub.run_in_thread(
+                sleep_time=1.0, daemon=True, exception_handler=_handle_listener_error
+            ))
+    except Exception as e:
+        print(f"❌ Redis subscribe failed for channel '{channel}': {e}")
+        for thread in threads:
+            thread.stop()
+        return []
+    return threads
+
+
+def enable_keyspace_notifications(flags: str = "Ex") -> bool:
+    """
+    Make sure the server publishes the given keyspace notification classes
+
+    Existing flags are kept; missing ones are added with CONFIG SET.
+    Managed Redis services often disable CONFIG, in which case the flags
+    must be set in the server configuration instead.
+
+    Args:
+        flags: notify-keyspace-events classes to enable (default: keyevent + expired)
+
+    Returns:
+        bool: True if the flags are enabled
+    """
+    try:
+        for client in node_clients():
+            current = client.config_get("notify-keyspace-events").get("notify-keyspace-events", "")
+            missing = "".join(flag for flag in flags if flag not in current)
+            if missing:
+                client.config_set("notify-keyspace-events", current + missing)
+        return True
+    except Exception as e:
+        print(f"⚠️  Could not enable keyspace notifications '{flags}': {e}")
+        return False
+
+
+def get_database_index() -> int:
+    """
+    Get the logical database the client is connected to
+
+    Returns:
+        int: Database index used in keyspace notification channels (always 0 in a cluster)
+    """
+    if CLUSTER_MODE:
+        return 0
+    return int(connection_pool.connection_kwargs.get("db", 0) or 0)
+
+
+def get_circuit_state() -> dict:
+    """
+    Get circuit breaker state
+
+    Returns:
+        dict: state (closed, open, half_open), failure counters and settings
+    """
+    return circuit_breaker.snapshot()
+
+
+def get_pool_stats() -> dict:
+    """
+    Get connection pool gauges
+
+    Returns:
+        dict: in_use, idle, max_connections, acquire counts and wait times
+            (in cluster mode: totals over the per-node pools)
+    """
+    if CLUSTER_MODE:
+        pools = [client.connection_pool for client in node_clients()]
+        return {
+            "cluster": True,
+            "nodes": len(pools),
+            "in_use": sum(len(pool._in_use_connections) for pool in pools),
+            "idle": sum(len(pool._available_connections) for pool in pools),
+            "max_connections": REDIS_MAX_CONNECTIONS * len(pools)
+        }
+    return connection_pool.get_stats()
+
+
 def get_redis_info() -> dict:
     """
     Get Redis server information
@@ -220,14 +906,18 @@ def get_redis_info() -> dict:
         dict: Redis server info
     """
     try:
-        info = redis_client.info()
-        return {
+        clients = node_clients()
+        info = clients[0].info()
+        result = {
             "connected": True,
             "version": info.get("redis_version"),
             "used_memory": info.get("used_memory_human"),
             "connected_clients": info.get("connected_clients"),
             "uptime_days": info.get("uptime_in_days")
         }
+        if CLUSTER_MODE:
+            result["cluster_primaries"] = len(clients)
+        return result
     except Exception as e:
         return {
             "connected": False,
@@ -0,0 +1,163 @@
+"""
+Refresh Tokens
+Opaque, single-use refresh tokens held in Redis
+
+Login issues a refresh token next to the access token. Exchanging it at
+/auth/refresh yields a new access token and a new refresh token without
+any password hashing: one script call marks the old record as used, and
+the user is read through the principal cache.
+
+Records are hashes at "refresh:<digest>" (the raw token is never stored)
+with the user ID, the user's session generation and the absolute expiry of
+the login. Rotated tokens keep their record as a marker until that expiry,
+so presenting one again is detected as reuse (a stolen token) and logs the
+user out everywhere. Bumping the generation (admin deactivation, "log out
+everywhere", bulk revoke) invalidates every outstanding refresh token.
+"""
+import hashlib
+import os
+import secrets
+import time
+from typing import Dict, Any, Optional, Tuple
+
+from redis_client import pipeline, register_script, run_script, delete_value
+import session_manager
+
+
+# Refresh token configuration
+REFRESH_PREFIX = "refresh"
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
+REFRESH_TOKEN_TTL = REFRESH_TOKEN_EXPIRE_DAYS * 86400  # Lifetime of a login (seconds)
+
+
+# Mark a refresh record as used and return it.
+# KEYS[1] = refresh record, ARGV[1] = rotation timestamp
+# Returns false if the record doesn't exist, otherwise
+# {1 if this call rotated it (0 if it was already used), flat HGETALL}
+_CONSUME_LUA = """
+local record = redis.call('HGETALL', KEYS[1])
+if #record == 0 then
+    return false
+end
+local fresh = redis.call('HSETNX', KEYS[1], 'rotated_at', ARGV[1])
+return {fresh, record}
+"""
+
+_consume_script = register_script(_CONSUME_LUA)
+
+
+def get_token_id(token: str) -> str:
+    """
+    Derive the stored identifier of a refresh token
+
+    Args:
+        token: Refresh token
+
+    Returns:
+        str: 32-character hex digest of the token
+    """
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _get_refresh_key(token: str) -> str:
+    """
+    Generate Redis key for a refresh record
+
+    Returns:
+        str: Redis key (e.g., "refresh:9f86d081884c7d65...")
+    """
+    return f"{REFRESH_PREFIX}:{get_token_id(token)}"
+
+
+def issue_refresh_token(user_id: str, generation: int, ip_address: Optional[str] = None,
+                        expires_at: Optional[float] = None) -> Optional[Tuple[str, int]]:
+    """
+    Create a refresh token for a user
+
+    Args:
+        user_id: User ID
+        generation: User's session generation (as embedded in the access token)
+        ip_address: Client IP address (optional)
+        expires_at: Absolute expiry as a Unix timestamp (default: now + REFRESH_TOKEN_TTL);
+            rotation passes the original login's expiry so refreshing never extends it
+
+    Returns:
+        tuple: (refresh token, lifetime in seconds), or None if it couldn't be stored
+    """
+    now = time.time()
+    expires_at = expires_at or now + REFRESH_TOKEN_TTL
+    ttl = int(expires_at - now)
+    if ttl <= 0:
+        return None
+
+    token = secrets.token_urlsafe(32)
+    key = _get_refresh_key(token)
+
+    try:
+        pipe = pipeline()
+        pipe.hset(key, mapping={
+            "user_id": user_id,
+            "gen": generation,
+            "ip_address": ip_address or "",
+            "created_at": int(now),
+            "expires_at": int(expires_at)
+        })
+        pipe.expire(key, ttl)
+        pipe.execute()
+        return token, ttl
+
+    except Exception as e:
+        print(f"❌ Error issuing refresh token for user {user_id}: {e}")
+        return None
+
+
+def consume_refresh_token(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Use up a refresh token
+
+    A token can be consumed once. Reusing a rotated token bumps the user's
+    session generation, revoking every access and refresh token they hold.
+
+    Args:
+        token: Refresh token
+
+    Returns:
+        dict: Record with user_id, gen (int), ip_address and expires_at (int),
+            or None if the token is unknown, expired, reused or revoked
+    """
+    result = run_script(_consume_script, keys=[_get_refresh_key(token)], args=[int(time.time())])
+    if not result:
+        return None
+
+    fresh, flat = result
+    record = dict(zip(flat[::2], flat[1::2]))
+    user_id = record.get("user_id")
+
+    if not fresh:
+        print(f"🚨 Refresh token reuse detected for user: {user_id}, revoking all sessions")
+        try:
+            session_manager.bump_user_generation(user_id)
+        except Exception as e:
+            print(f"❌ Error revoking sessions after refresh token reuse: {e}")
+        return None
+
+    record["gen"] = int(record.get("gen") or 0)
+    record["expires_at"] = int(record.get("expires_at") or 0)
+
+    if record["gen"] != session_manager.get_user_generation(user_id):
+        return None
+
+    return record
+
+
+def revoke_refresh_token(token: str) -> bool:
+    """
+    Delete a refresh token (logout)
+
+    Args:
+        token: Refresh token
+
+    Returns:
+        bool: True if the token existed
+    """
+    return delete_value(_get_refresh_key(token))
@@ -3,12 +3,13 @@ Admin Routes
 User management, analytics, and audit log endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, or_, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from datetime import datetime
 
-from database import get_db
+from database import get_async_db
 from models import User, AuditLog
 from schemas import (
     UserResponse,
@@ -19,25 +20,36 @@ from schemas import (
     AuditLogListResponse
 )
 from auth import (
-    require_admin,
-    require_super_admin,
+    require_admin_async,
     get_client_ip,
     get_user_agent,
-    get_password_hash
+    get_password_hash_async
 )
+import session_manager
+import principal_cache
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
 
+def _invalidate_user(user_id: str, log_out: bool = False) -> None:
+    """
+    Drop a changed user's cached principal and optionally log them out
+    everywhere (blocking Redis calls, run in the threadpool)
+    """
+    principal_cache.invalidate(user_id)
+    if log_out:
+        session_manager.bump_user_generation(user_id)
+
+
 @router.get("/users", response_model=UserListResponse)
-def get_all_users(
+async def get_all_users(
     search: Optional[str] = Query(None, description="Search by user_id, email, or name"),
     role: Optional[UserRole] = Query(None, description="Filter by role"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Items per page"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_admin_async)
 ):
     """
     Get list of all users with search and filter capabilities
@@ -55,7 +67,7 @@ def get_all_users(
         UserListResponse: List of users with pagination info
     """
     # Base query
-    query = db.query(User)
+    query = select(User)
 
     # Apply search filter
     if search:
@@ -64,25 +76,26 @@ def get_all_users(
             User.email.ilike(f"%{search}%"),
             User.name.ilike(f"%{search}%")
         )
-        query = query.filter(search_filter)
+        query = query.where(search_filter)
 
     # Apply role filter
     if role:
-        query = query.filter(User.role == role.value)
+        query = query.where(User.role == role.value)
 
     # Apply active status filter
     if is_active is not None:
-        query = query.filter(User.is_active == is_active)
+        query = query.where(User.is_active == is_active)
 
     # Get total count
-    total = query.count()
+    total = (await db.execute(select(func.count()).select_from(query.subquery()))).scalar_one()
 
     # Calculate pagination
     total_pages = (total + page_size - 1) // page_size
     offset = (page - 1) * page_size
 
     # Get users for current page
-    users = query.order_by(User.created_at.desc()).offset(offset).limit(page_size).all()
+    result = await db.execute(query.order_by(User.created_at.desc()).offset(offset).limit(page_size))
+    users = result.scalars().all()
 
     return UserListResponse(
         users=users,
@@ -94,10 +107,10 @@ def get_all_users(
 
 
 @router.get("/users/{user_id}", response_model=UserResponse)
-def get_user_by_id(
+async def get_user_by_id(
     user_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_admin_async)
 ):
     """
     Get specific user by user_id
@@ -113,7 +126,7 @@ def get_user_by_id(
     Raises:
         HTTPException: If user not found
     """
-    user = db.query(User).filter(User.user_id == user_id).first()
+    user = (await db.execute(select(User).where(User.user_id == user_id))).scalar_one_or_none()
 
     if not user:
         raise HTTPException(
@@ -125,11 +138,11 @@ def get_user_by_id(
 
 
 @router.put("/users/{user_id}", response_model=UserResponse)
-def update_user(
+async def update_user(
     user_id: str,
     user_update: UserUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_admin_async),
     ip_address: str = Depends(get_client_ip)
 ):
     """
@@ -149,7 +162,7 @@ def update_user(
         HTTPException: If user not found or permission denied
     """
     # Get user to update
-    user = db.query(User).filter(User.user_id == user_id).first()
+    user = (await db.execute(select(User).where(User.user_id == user_id))).scalar_one_or_none()
 
     if not user:
         raise HTTPException(
@@ -172,8 +185,10 @@ def update_user(
         else:
             setattr(user, field, value)
 
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    # Log the user out everywhere when the account is deactivated
+    await run_in_threadpool(_invalidate_user, user_id, log_out=update_data.get("is_active") is False)
 
     # Log action
     log_entry = AuditLog(
@@ -185,16 +200,16 @@ def update_user(
         ip_address=ip_address
     )
     db.add(log_entry)
-    db.commit()
+    await db.commit()
 
     return user
 
 
 @router.post("/users/{user_id}/activate", response_model=UserResponse)
-def activate_user(
+async def activate_user(
     user_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_admin_async),
     ip_address: str = Depends(get_client_ip)
 ):
     """
@@ -209,7 +224,7 @@ def activate_user(
     Returns:
         UserResponse: Updated user information
     """
-    user = db.query(User).filter(User.user_id == user_id).first()
+    user = (await db.execute(select(User).where(User.user_id == user_id))).scalar_one_or_none()
 
     if not user:
         raise HTTPException(
@@ -225,8 +240,9 @@ def activate_user(
         )
 
     user.is_active = True
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    await run_in_threadpool(_invalidate_user, user_id)
 
     # Log action
     log_entry = AuditLog(
@@ -238,16 +254,16 @@ def activate_user(
         ip_address=ip_address
     )
     db.add(log_entry)
-    db.commit()
+    await db.commit()
 
     return user
 
 
 @router.post("/users/{user_id}/deactivate", response_model=UserResponse)
-def deactivate_user(
+async def deactivate_user(
     user_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_admin_async),
     ip_address: str = Depends(get_client_ip)
 ):
     """
@@ -262,7 +278,7 @@ def deactivate_user(
     Returns:
         UserResponse: Updated user information
     """
-    user = db.query(User).filter(User.user_id == user_id).first()
+    user = (await db.execute(select(User).where(User.user_id == user_id))).scalar_one_or_none()
 
     if not user:
         raise HTTPException(
@@ -285,8 +301,11 @@ def deactivate_user(
         )
 
     user.is_active = False
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+
+    # Log the user out everywhere
+    await run_in_threadpool(_invalidate_user, user_id, log_out=True)
 
     # Log action
     log_entry = AuditLog(
@@ -298,16 +317,16 @@ def deactivate_user(
         ip_address=ip_address
     )
     db.add(log_entry)
-    db.commit()
+    await db.commit()
 
     return user
 
 
 @router.delete("/users/{user_id}")
-def delete_user(
+async def delete_user(
     user_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_admin_async),
     ip_address: str = Depends(get_client_ip)
 ):
     """
@@ -325,7 +344,7 @@ def delete_user(
     Raises:
         HTTPException: If user not found or permission denied
     """
-    user = db.query(User).filter(User.user_id == user_id).first()
+    user = (await db.execute(select(User).where(User.user_id == user_id))).scalar_one_or_none()
 
     if not user:
         raise HTTPException(
@@ -359,17 +378,20 @@ def delete_user(
     db.add(log_entry)
 
     # Delete user
-    db.delete(user)
-    db.commit()
+    await db.delete(user)
+    await db.commit()
+
+    # Log the user out everywhere
+    await run_in_threadpool(_invalidate_user, user_id, log_out=True)
 
     return {"message": f"User '{user_id}' deleted successfully"}
 
 
 @router.post("/users/{user_id}/reset-password")
-def reset_user_password(
+async def reset_user_password(
     user_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_admin_async),
     ip_address: str = Depends(get_client_ip)
 ):
     """
@@ -386,7 +408,7 @@ def reset_user_password(
 
     Note: In production, this should send an email instead of returning password
     """
-    user = db.query(User).filter(User.user_id == user_id).first()
+    user = (await db.execute(select(User).where(User.user_id == user_id))).scalar_one_or_none()
 
     if not user:
         raise HTTPException(
@@ -403,8 +425,11 @@ def reset_user_password(
 
     # Generate temporary password
     temp_password = f"Temp{user_id}123!"
-    user.password_hash = get_password_hash(temp_password)
-    db.commit()
+    user.password_hash = await get_password_hash_async(temp_password)
+    await db.commit()
+
+    # Sessions opened with the old password are logged out everywhere
+    await run_in_threadpool(_invalidate_user, user_id, log_out=True)
 
     # Log action
     log_entry = AuditLog(
@@ -416,7 +441,7 @@ def reset_user_password(
         ip_address=ip_address
     )
     db.add(log_entry)
-    db.commit()
+    await db.commit()
 
     # TODO: In production, send email instead
     return {
@@ -427,13 +452,13 @@ def reset_user_password(
 
 
 @router.get("/audit-logs", response_model=AuditLogListResponse)
-def get_audit_logs(
+async def get_audit_logs(
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
     action: Optional[str] = Query(None),
     admin_id: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_admin_async)
 ):
     """
     Get audit logs with pagination and filters
@@ -449,22 +474,23 @@ def get_audit_logs(
     Returns:
         AuditLogListResponse: List of audit logs
     """
-    query = db.query(AuditLog)
+    query = select(AuditLog)
 
     # Apply filters
     if action:
-        query = query.filter(AuditLog.action == action)
+        query = query.where(AuditLog.action == action)
     if admin_id:
-        query = query.filter(AuditLog.admin_id == admin_id)
+        query = query.where(AuditLog.admin_id == admin_id)
 
     # Get total count
-    total = query.count()
+    total = (await db.execute(select(func.count()).select_from(query.subquery()))).scalar_one()
 
     # Calculate offset
     offset = (page - 1) * page_size
 
     # Get logs for current page
-    logs = query.order_by(AuditLog.timestamp.desc()).offset(offset).limit(page_size).all()
+    result = await db.execute(query.order_by(AuditLog.timestamp.desc()).offset(offset).limit(page_size))
+    logs = result.scalars().all()
 
     return AuditLogListResponse(
         logs=logs,
@@ -475,9 +501,9 @@ def get_audit_logs(
 
 
 @router.get("/analytics/users")
-def get_user_analytics(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin)
+async def get_user_analytics(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(require_admin_async)
 ):
     """
     Get user analytics and statistics
@@ -490,25 +516,26 @@ def get_user_analytics(
         dict: User analytics data
     """
     # Total users
-    total_users = db.query(func.count(User.id)).scalar()
+    total_users = (await db.execute(select(func.count(User.id)))).scalar()
 
     # Active users
-    active_users = db.query(func.count(User.id)).filter(User.is_active == True).scalar()
+    active_users = (await db.execute(
+        select(func.count(User.id)).where(User.is_active == True)
+    )).scalar()
 
     # Users by role
-    users_by_role = db.query(
-        User.role,
-        func.count(User.id)
-    ).group_by(User.role).all()
+    users_by_role = (await db.execute(
+        select(User.role, func.count(User.id)).group_by(User.role)
+    )).all()
 
     role_distribution = {role: count for role, count in users_by_role}
 
     # Recent registrations (last 7 days)
     from datetime import datetime, timedelta
     week_ago = datetime.utcnow() - timedelta(days=7)
-    recent_registrations = db.query(func.count(User.id)).filter(
-        User.created_at >= week_ago
-    ).scalar()
+    recent_registrations = (await db.execute(
+        select(func.count(User.id)).where(User.created_at >= week_ago)
+    )).scalar()
 
     return {
         "total_users": total_users,
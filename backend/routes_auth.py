@@ -1,42 +1,118 @@
 """
 Authentication Routes
-Login, register, logout endpoints with Redis session management
+Login, refresh, register, logout endpoints with Redis session management
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Header
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, or_
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 from typing import Optional
 
-from database import get_db
+from database import get_async_db
 from models import User
-from schemas import LoginRequest, LoginResponse, UserCreate, UserResponse
+from schemas import LoginRequest, LoginResponse, RefreshRequest, UserCreate, UserResponse
 from auth import (
-    verify_password,
-    get_password_hash,
+    verify_password_async,
+    get_password_hash_async,
+    rehash_password_async,
     create_access_token,
-    get_current_user,
-    get_client_ip
+    get_current_user_async,
+    get_client_ip,
+    ensure_session_store_available
 )
 import session_manager
+import async_session_manager
+import principal_cache
+import rate_limiter
+import refresh_tokens
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
-@router.post("/login", response_model=LoginResponse)
-def login(
+def _issue_tokens(user: User, ip_address: Optional[str], generation: Optional[int] = None,
+                  refresh_expires_at: Optional[float] = None) -> LoginResponse:
+    """
+    Create an access token, its Redis session and a refresh token
+
+    Makes several blocking Redis calls; async handlers run it in the
+    threadpool.
+
+    Args:
+        user: Authenticated user
+        ip_address: Client IP address
+        generation: User's session generation (read from Redis if omitted)
+        refresh_expires_at: Expiry of the login being refreshed (new login if omitted)
+
+    Returns:
+        LoginResponse: Tokens and user info
+    """
+    if generation is None:
+        generation = session_manager.get_user_generation(user.user_id)
+
+    # Create tokens
+    access_token = create_access_token(
+        data={"sub": user.user_id, "role": user.role, "gen": generation},
+        expires_delta=timedelta(minutes=60)
+    )
+    issued = refresh_tokens.issue_refresh_token(
+        user.user_id, generation, ip_address=ip_address, expires_at=refresh_expires_at
+    )
+    refresh_token, refresh_expires_in = issued if issued else (None, None)
+
+    # Create Redis session
+    session_data = {
+        "user_id": user.user_id,
+        "user_name": user.name,
+        "email": user.email,
+        "role": user.role,
+        "ip_address": ip_address
+    }
+    if refresh_token:
+        session_data["refresh_token_id"] = refresh_tokens.get_token_id(refresh_token)
+
+    session_created = session_manager.create_session(token=access_token, user_data=session_data)
+
+    if not session_created:
+        print(f"⚠️  Warning: Failed to create Redis session for user {user.user_id}")
+
+    return LoginResponse(
+        user_id=user.user_id,
+        user_name=user.name,
+        email=user.email,
+        role=user.role,
+        access_token=access_token,
+        token_type="bearer",
+        expires_in=3600,
+        refresh_token=refresh_token,
+        refresh_expires_in=refresh_expires_in
+    )
+
+
+@router.post("/login", response_model=LoginResponse, dependencies=[Depends(rate_limiter.limit_by_ip("login"))])
+async def login(
     credentials: LoginRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     ip_address: str = Depends(get_client_ip)
 ):
     """User login - returns JWT token"""
+    # Don't spend a bcrypt check on a login whose session can't be stored
+    ensure_session_store_available()
+
     # Find user by user_id or email
-    user = db.query(User).filter(
-        (User.user_id == credentials.user_id) |
-        (User.email == credentials.user_id)
-    ).first()
+    result = await db.execute(select(User).where(
+        or_(User.user_id == credentials.user_id, User.email == credentials.user_id)
+    ))
+    user = result.scalars().first()
+
+    # Throttle guessing against a single account before bcrypt, keyed by the
+    # resolved account so alternating user ID and email shares one budget
+    await rate_limiter.enforce_async(
+        "login", "user", user.user_id if user else credentials.user_id.lower()
+    )
 
     # Verify credentials
-    if not user or not verify_password(credentials.password, user.password_hash):
+    if not user or not await verify_password_async(credentials.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect user ID or password",
@@ -50,54 +126,72 @@ def login(
             detail="User account is inactive"
         )
 
+    # Move the stored hash to the current bcrypt cost while we have the password
+    new_hash = await rehash_password_async(credentials.password, user.password_hash)
+    if new_hash:
+        user.password_hash = new_hash
+
     # Update last login
     user.last_login = datetime.utcnow()
-    db.commit()
+    await db.commit()
+    await principal_cache.store_principal_async(user)
 
-    # Create token
-    access_token = create_access_token(
-        data={"sub": user.user_id, "role": user.role},
-        expires_delta=timedelta(minutes=60)
-    )
+    return await run_in_threadpool(_issue_tokens, user, ip_address)
 
-    # Create Redis session
-    session_created = session_manager.create_session(
-        token=access_token,
-        user_data={
-            "user_id": user.user_id,
-            "user_name": user.name,
-            "email": user.email,
-            "role": user.role,
-            "ip_address": ip_address
-        }
-    )
 
-    if not session_created:
-        print(f"⚠️  Warning: Failed to create Redis session for user {user.user_id}")
+@router.post("/refresh", response_model=LoginResponse)
+async def refresh(
+    request: RefreshRequest,
+    db: AsyncSession = Depends(get_async_db),
+    ip_address: str = Depends(get_client_ip)
+):
+    """
+    Exchange a refresh token for a new access token and refresh token
 
-    return LoginResponse(
-        user_id=user.user_id,
-        user_name=user.name,
-        email=user.email,
-        role=user.role,
-        access_token=access_token,
-        token_type="bearer",
-        expires_in=3600
+    No password check: the refresh token is used up in one Redis script
+    call and the user comes from the principal cache. The new refresh
+    token expires with the original login.
+    """
+    ensure_session_store_available()
+
+    record = await run_in_threadpool(refresh_tokens.consume_refresh_token, request.refresh_token)
+    if not record:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    user = await principal_cache.load_user_async(record["user_id"], db)
+    if not user or not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found or inactive",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return await run_in_threadpool(
+        _issue_tokens, user, ip_address, generation=record["gen"], refresh_expires_at=record["expires_at"]
     )
 
 
-@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+@router.post(
+    "/register",
+    response_model=UserResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limiter.limit_by_ip("register"))]
+)
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """User registration"""
     # Check if user_id exists
-    if db.query(User).filter(User.user_id == user_data.user_id).first():
+    if (await db.execute(select(User.id).where(User.user_id == user_data.user_id))).first():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User ID already registered"
         )
 
     # Check if email exists
-    if db.query(User).filter(User.email == user_data.email).first():
+    if (await db.execute(select(User.id).where(User.email == user_data.email))).first():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
@@ -108,32 +202,36 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
         user_id=user_data.user_id,
         email=user_data.email,
         name=user_data.name,
-        password_hash=get_password_hash(user_data.password),
+        password_hash=await get_password_hash_async(user_data.password),
         role=user_data.role.value,
         is_active=True
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
 
     return new_user
 
 
 @router.get("/me", response_model=UserResponse)
-def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(current_user: User = Depends(get_current_user_async)):
     """Get current user info"""
     return current_user
 
 
 @router.post("/logout")
-def logout(authorization: Optional[str] = Header(None)):
+async def logout(authorization: Optional[str] = Header(None), request: Optional[RefreshRequest] = None):
     """
-    Logout - removes session from Redis
+    Logout - removes session (and refresh token, if given) from Redis
 
     Args:
         authorization: Bearer token from Authorization header
+        request: Refresh token to revoke (optional body)
     """
+    if request is not None:
+        await run_in_threadpool(refresh_tokens.revoke_refresh_token, request.refresh_token)
+
     if not authorization or not authorization.startswith("Bearer "):
         return {"message": "No active session to logout"}
 
@@ -141,7 +239,7 @@ def logout(authorization: Optional[str] = Header(None)):
     token = authorization.replace("Bearer ", "")
 
     # Delete Redis session
-    session_deleted = session_manager.delete_session(token)
+    session_deleted = await async_session_manager.delete_session(token)
 
     if session_deleted:
         return {"message": "Successfully logged out"}
@@ -1,22 +1,30 @@
 """
 Session Management Routes
 Admin endpoints for managing user sessions in Redis
+
+Authentication runs on the event loop (async dependencies); the handlers
+make blocking Redis calls and stay sync, so they run in the threadpool.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List, Dict, Any
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.security import HTTPAuthorizationCredentials
+from typing import List, Dict, Any, Optional
+from pydantic import BaseModel, Field
 
-from auth import require_admin, get_current_user
+from auth import require_admin_async, get_current_user_async, security
 from models import User
 import session_manager
+import session_maintenance
 
 
 router = APIRouter(prefix="/session", tags=["Session Management"])
 
+REVOKE_CHUNK_SIZE = 500  # Users revoked per pair of Redis round trips
+
 
 # Response schemas
 class SessionInfo(BaseModel):
     """Single session information"""
+    session_id: str
     user_id: str
     user_name: str
     email: str
@@ -32,56 +40,64 @@ class SessionStats(BaseModel):
     total_sessions: int
     sessions_by_role: Dict[str, int]
     average_ttl: int
+    expired_sessions: int = 0
+    expired_by_role: Dict[str, int] = {}
+
+
+class BulkRevokeRequest(BaseModel):
+    """Users whose sessions should be revoked"""
+    user_ids: List[str] = Field(..., min_length=1, max_length=10000)
+
+
+class BulkRevokeResponse(BaseModel):
+    """Bulk revocation result"""
+    deleted_count: int
+    deleted_by_user: Dict[str, int]
 
 
 class SessionListResponse(BaseModel):
     """List of sessions response"""
     sessions: List[Dict[str, Any]]
     total: int
+    next_cursor: Optional[int] = None
 
 
 # ==================== User Session Endpoints ====================
 
 @router.get("/me", response_model=SessionInfo)
-def get_my_session(current_user: User = Depends(get_current_user)):
+def get_my_session(
+    current_user: User = Depends(get_current_user_async),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
     """
     Get current user's session information
 
     Returns:
         SessionInfo: Current session details
     """
-    # Note: In real implementation, we need to pass the token
-    # For now, we'll get all user sessions and return the first one
-    user_sessions = session_manager.get_user_sessions(current_user.user_id)
+    session_data = session_manager.get_session_info(credentials.credentials)
 
-    if not user_sessions:
+    if not session_data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No active session found"
         )
 
-    session_data = user_sessions[0]  # Get most recent session
     return SessionInfo(**session_data)
 
 
 @router.post("/refresh")
-def refresh_my_session(current_user: User = Depends(get_current_user)):
+def refresh_my_session(
+    current_user: User = Depends(get_current_user_async),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
     """
     Refresh current user's session (extend TTL)
 
     Returns:
         dict: Success message
     """
-    user_sessions = session_manager.get_user_sessions(current_user.user_id)
-
-    if not user_sessions:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No active session found"
-        )
-
-    token = user_sessions[0].get("token")
-    refreshed = session_manager.refresh_session(token)
+    refreshed = session_manager.refresh_session(credentials.credentials)
 
     if refreshed:
         return {"message": "Session refreshed successfully"}
@@ -94,23 +110,33 @@ def refresh_my_session(current_user: User = Depends(get_current_user)):
 
 # ==================== Admin Session Endpoints ====================
 
-@router.get("/all", response_model=SessionListResponse, dependencies=[Depends(require_admin)])
-def get_all_sessions():
+@router.get("/all", response_model=SessionListResponse, dependencies=[Depends(require_admin_async)])
+def get_all_sessions(
+    cursor: int = Query(0, ge=0, description="Cursor from the previous page (0 to start)"),
+    count: int = Query(100, ge=1, le=1000, description="Approximate page size")
+):
     """
-    Get all active sessions (Admin only)
+    Get one page of active sessions (Admin only)
+
+    Iterate by passing next_cursor back as cursor until it is 0.
+
+    Args:
+        cursor: SCAN cursor returned by the previous page
+        count: Approximate number of sessions per page
 
     Returns:
-        SessionListResponse: List of all active sessions
+        SessionListResponse: Sessions in this page and the next cursor
     """
-    all_sessions = session_manager.get_all_sessions()
+    next_cursor, sessions = session_manager.get_all_sessions(cursor, count)
 
     return SessionListResponse(
-        sessions=all_sessions,
-        total=len(all_sessions)
+        sessions=sessions,
+        total=len(sessions),
+        next_cursor=next_cursor
     )
 
 
-@router.get("/stats", response_model=SessionStats, dependencies=[Depends(require_admin)])
+@router.get("/stats", response_model=SessionStats, dependencies=[Depends(require_admin_async)])
 def get_session_statistics():
     """
     Get session statistics (Admin only)
@@ -123,11 +149,13 @@ def get_session_statistics():
     return SessionStats(
         total_sessions=stats.get("total_sessions", 0),
         sessions_by_role=stats.get("sessions_by_role", {}),
-        average_ttl=stats.get("average_ttl", 0)
+        average_ttl=stats.get("average_ttl", 0),
+        expired_sessions=stats.get("expired_sessions", 0),
+        expired_by_role=stats.get("expired_by_role", {})
     )
 
 
-@router.get("/user/{user_id}", response_model=SessionListResponse, dependencies=[Depends(require_admin)])
+@router.get("/user/{user_id}", response_model=SessionListResponse, dependencies=[Depends(require_admin_async)])
 def get_user_sessions_admin(user_id: str):
     """
     Get all sessions for a specific user (Admin only)
@@ -152,7 +180,7 @@ def get_user_sessions_admin(user_id: str):
     )
 
 
-@router.delete("/user/{user_id}", dependencies=[Depends(require_admin)])
+@router.delete("/user/{user_id}", dependencies=[Depends(require_admin_async)])
 def delete_user_sessions_admin(user_id: str):
     """
     Delete all sessions for a specific user (Admin only)
@@ -179,20 +207,54 @@ def delete_user_sessions_admin(user_id: str):
     }
 
 
-@router.post("/cleanup", dependencies=[Depends(require_admin)])
+@router.post("/revoke", response_model=BulkRevokeResponse, dependencies=[Depends(require_admin_async)])
+def revoke_sessions_bulk(request: BulkRevokeRequest):
+    """
+    Revoke all sessions for many users at once (Admin only)
+
+    Useful after a mass deactivation. Users are processed in chunks of
+    REVOKE_CHUNK_SIZE, each costing two Redis round trips.
+
+    Args:
+        request: User IDs to log out from all devices
+
+    Returns:
+        BulkRevokeResponse: Number of sessions deleted, total and per user
+    """
+    deleted_by_user = {}
+    for start in range(0, len(request.user_ids), REVOKE_CHUNK_SIZE):
+        chunk = request.user_ids[start:start + REVOKE_CHUNK_SIZE]
+        try:
+            deleted_by_user.update(session_manager.revoke_user_sessions(chunk))
+        except Exception as e:
+            print(f"❌ Error revoking sessions: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Failed to revoke sessions"
+            )
+
+    return BulkRevokeResponse(
+        deleted_count=sum(deleted_by_user.values()),
+        deleted_by_user=deleted_by_user
+    )
+
+
+@router.post("/cleanup", dependencies=[Depends(require_admin_async)])
 def cleanup_expired_sessions_admin():
     """
-    Manually cleanup expired sessions (Admin only)
+    Manually run a full cleanup pass (Admin only)
 
-    Note: Redis automatically removes expired keys,
-    but this endpoint can be used for manual cleanup
+    Note: Redis expires session keys automatically and the background
+    sweeper prunes their bookkeeping incrementally; this endpoint runs
+    a complete pass over the user indexes and stats counters at once
 
     Returns:
-        dict: Cleanup results
+        dict: Cleanup results and sweeper metrics
     """
     cleaned_count = session_manager.cleanup_expired_sessions()
 
     return {
         "message": f"Cleanup completed",
-        "cleaned_sessions": cleaned_count
+        "cleaned_sessions": cleaned_count,
+        "sweeper": session_maintenance.get_metrics()
     }
@@ -81,6 +81,13 @@ class LoginResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
     expires_in: int = 3600
+    refresh_token: Optional[str] = None
+    refresh_expires_in: Optional[int] = None
+
+
+class RefreshRequest(BaseModel):
+    """Schema for exchanging a refresh token"""
+    refresh_token: str
 
 
 # ==================== Audit Log Schemas ====================
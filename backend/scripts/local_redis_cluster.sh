@@ -0,0 +1,78 @@
+#!/usr/bin/env bash
+# Local Redis Cluster for development
+#
+# Starts several redis-server processes in cluster mode and joins them into
+# one cluster, so the backend can be run against it with:
+#
+#   REDIS_CLUSTER_NODES=127.0.0.1:7000,127.0.0.1:7001,127.0.0.1:7002 uvicorn main:app
+#
+# Usage:
+#   ./scripts/local_redis_cluster.sh start   # start nodes and create the cluster
+#   ./scripts/local_redis_cluster.sh stop    # stop all nodes
+#   ./scripts/local_redis_cluster.sh clean   # stop and remove node data
+#
+# Environment:
+#   CLUSTER_BASE_PORT  first port (default 7000)
+#   CLUSTER_PRIMARIES  number of primaries (default 3)
+#   CLUSTER_REPLICAS   replicas per primary (default 0)
+#   REDIS_PASSWORD     password for every node (default redis123)
+#   CLUSTER_DIR        working directory for node data (default /tmp/redis-cluster)
+
+set -euo pipefail
+
+BASE_PORT=${CLUSTER_BASE_PORT:-7000}
+PRIMARIES=${CLUSTER_PRIMARIES:-3}
+REPLICAS=${CLUSTER_REPLICAS:-0}
+PASSWORD=${REDIS_PASSWORD:-redis123}
+DIR=${CLUSTER_DIR:-/tmp/redis-cluster}
+NODES=$((PRIMARIES * (REPLICAS + 1)))
+
+ports() {
+    seq "$BASE_PORT" $((BASE_PORT + NODES - 1))
+}
+
+start() {
+    local addresses=()
+    for port in $(ports); do
+        mkdir -p "$DIR/$port"
+        redis-server \
+            --port "$port" \
+            --cluster-enabled yes \
+            --cluster-config-file "$DIR/$port/nodes.conf" \
+            --cluster-node-timeout 5000 \
+            --dir "$DIR/$port" \
+            --appendonly no \
+            --requirepass "$PASSWORD" \
+            --masterauth "$PASSWORD" \
+            --notify-keyspace-events Ex \
+            --daemonize yes \
+            --logfile "$DIR/$port/redis.log"
+        addresses+=("127.0.0.1:$port")
+    done
+
+    # Give the servers a moment to accept connections
+    sleep 1
+
+    if redis-cli -p "$BASE_PORT" -a "$PASSWORD" --no-auth-warning cluster info | grep -q "cluster_state:ok"; then
+        echo "✅ Cluster already running on ports $(ports | paste -sd, -)"
+        return
+    fi
+
+    redis-cli -a "$PASSWORD" --no-auth-warning --cluster create "${addresses[@]}" \
+        --cluster-replicas "$REPLICAS" --cluster-yes
+    echo "✅ Cluster ready: REDIS_CLUSTER_NODES=$(IFS=,; echo "${addresses[*]}")"
+}
+
+stop() {
+    for port in $(ports); do
+        redis-cli -p "$port" -a "$PASSWORD" --no-auth-warning shutdown nosave 2>/dev/null || true
+    done
+    echo "🛑 Cluster stopped"
+}
+
+case "${1:-start}" in
+    start) start ;;
+    stop) stop ;;
+    clean) stop; rm -rf "$DIR"; echo "🧹 Removed $DIR" ;;
+    *) echo "Usage: $0 {start|stop|clean}"; exit 1 ;;
+esac
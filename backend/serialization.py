@@ -0,0 +1,109 @@
+"""
+Payload Serialization
+Pluggable, version-tagged codecs for values stored in Redis
+
+Encoded values start with a tag naming the codec and format version
+(e.g., "\\x1eo1" for orjson v1), so readers pick the right decoder without
+guessing and values written by older code (untagged JSON) still decode.
+"""
+import json
+import os
+from typing import Any, Dict
+
+try:
+    import orjson
+except ImportError:  # Optional dependency; fall back to stdlib json
+    orjson = None
+
+
+TAG_MARKER = "\x1e"  # ASCII record separator, never produced by JSON encoders
+TAG_LENGTH = 3  # marker + codec id + version
+
+
+class JsonCodec:
+    """Stdlib JSON codec"""
+    tag = f"{TAG_MARKER}j1"
+
+    @staticmethod
+    def encode(value: Any) -> str:
+        return json.dumps(value, separators=(",", ":"))
+
+    @staticmethod
+    def decode(text: str) -> Any:
+        return json.loads(text)
+
+
+class OrjsonCodec:
+    """orjson codec (faster encode/decode, same JSON payload)"""
+    tag = f"{TAG_MARKER}o1"
+
+    @staticmethod
+    def encode(value: Any) -> str:
+        return orjson.dumps(value).decode("utf-8")
+
+    @staticmethod
+    def decode(text: str) -> Any:
+        return orjson.loads(text)
+
+
+CODECS: Dict[str, Any] = {JsonCodec.tag: JsonCodec}
+if orjson is not None:
+    CODECS[OrjsonCodec.tag] = OrjsonCodec
+
+_CODECS_BY_NAME = {"json": JsonCodec, "orjson": OrjsonCodec}
+_default_name = os.getenv("REDIS_CODEC", "orjson" if orjson is not None else "json")
+DEFAULT_CODEC = _CODECS_BY_NAME.get(_default_name, JsonCodec)
+if DEFAULT_CODEC is OrjsonCodec and orjson is None:
+    print("⚠️  REDIS_CODEC=orjson but orjson is not installed, using json")
+    DEFAULT_CODEC = JsonCodec
+
+
+def is_encoded(text: str) -> bool:
+    """
+    Check whether a stored string carries a codec tag
+
+    Args:
+        text: Value read from Redis
+
+    Returns:
+        bool: True if the value was written by encode()
+    """
+    return text[:1] == TAG_MARKER
+
+
+def encode(value: Any) -> str:
+    """
+    Encode a value with the default codec, prefixed with its tag
+
+    Args:
+        value: JSON-serializable value
+
+    Returns:
+        str: Tagged payload
+    """
+    return DEFAULT_CODEC.tag + DEFAULT_CODEC.encode(value)
+
+
+def decode(text: str) -> Any:
+    """
+    Decode a value read from Redis
+
+    Tagged values go straight to their codec. Untagged values (written
+    before codecs existed) are parsed as JSON, falling back to the raw string.
+
+    Args:
+        text: Value read from Redis
+
+    Returns:
+        Decoded value
+    """
+    if is_encoded(text):
+        codec = CODECS.get(text[:TAG_LENGTH])
+        if codec is None:
+            raise ValueError(f"Unknown codec tag: {text[:TAG_LENGTH]!r}")
+        return codec.decode(text[TAG_LENGTH:])
+
+    try:
+        return json.loads(text)
+    except (json.JSONDecodeError, TypeError):
+        return text
@@ -0,0 +1,186 @@
+"""
+In-Process Session Cache
+Bounded, short-lived LRU of session lookups in front of Redis
+
+Hot tokens are served from memory. Deletes and updates are broadcast
+over Redis pub/sub so every worker drops its copy immediately; if a
+message is missed, entries still expire after SESSION_CACHE_TTL seconds.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+
+from redis_client import publish, subscribe
+
+
+# Cache configuration
+CACHE_MAX_ENTRIES = int(os.getenv("SESSION_CACHE_MAX_ENTRIES", "10000"))
+CACHE_TTL = float(os.getenv("SESSION_CACHE_TTL", "5"))  # seconds
+INVALIDATION_CHANNEL = "session_invalidation"
+
+# Invalidation message prefixes
+KEY_MESSAGE = "key:"
+USER_MESSAGE = "user:"
+
+
+class SessionCache:
+    """Thread-safe LRU cache whose entries expire after a TTL"""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached session, or None if missing/expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, session_data = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(session_data)
+
+    def set(self, key: str, session_data: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        """Cache a session for at most ttl seconds (default: cache TTL)"""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, dict(session_data))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Drop one cached session"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_user(self, user_id: str) -> None:
+        """Drop every cached session belonging to a user"""
+        with self._lock:
+            stale = [
+                key for key, (_, session_data) in self._entries.items()
+                if session_data.get("user_id") == user_id
+            ]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop all cached sessions"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache size and hit/miss counters"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+cache = SessionCache(CACHE_MAX_ENTRIES, CACHE_TTL)
+_user_caches = [cache]  # Caches whose entries are dropped by user invalidations
+_listener = None
+
+
+# ==================== Invalidation ====================
+
+def register_user_cache(user_cache: SessionCache) -> None:
+    """
+    Have user invalidations also clear another per-user cache
+
+    Args:
+        user_cache: Cache whose entries carry a "user_id" field
+    """
+    if user_cache not in _user_caches:
+        _user_caches.append(user_cache)
+
+
+def _delete_user_entries(user_id: str) -> None:
+    for user_cache in _user_caches:
+        user_cache.delete_user(user_id)
+
+
+def invalidate_key(session_key: str) -> None:
+    """
+    Drop a session from this worker's cache and tell the other workers
+
+    Args:
+        session_key: Session Redis key
+    """
+    cache.delete(session_key)
+    publish(INVALIDATION_CHANNEL, f"{KEY_MESSAGE}{session_key}")
+
+
+def invalidate_user(user_id: str, pipe=None) -> None:
+    """
+    Drop all of a user's cached entries from every worker's caches
+
+    Args:
+        user_id: User ID
+        pipe: Pipeline to queue the broadcast on (optional, single server
+            only: a cluster pipeline rejects PUBLISH)
+    """
+    _delete_user_entries(user_id)
+    message = f"{USER_MESSAGE}{user_id}"
+    if pipe is not None:
+        pipe.publish(INVALIDATION_CHANNEL, message)
+    else:
+        publish(INVALIDATION_CHANNEL, message)
+
+
+def _handle_invalidation(message: dict) -> None:
+    """Apply an invalidation message received from another worker"""
+    data = message.get("data")
+    if not isinstance(data, str):
+        return
+
+    if data.startswith(KEY_MESSAGE):
+        cache.delete(data[len(KEY_MESSAGE):])
+    elif data.startswith(USER_MESSAGE):
+        _delete_user_entries(data[len(USER_MESSAGE):])
+
+
+def start_invalidation_listener() -> bool:
+    """
+    Start listening for invalidations from other workers
+
+    Returns:
+        bool: True if the listener is running
+    """
+    global _listener
+    if _listener is None:
+        _listener = subscribe(INVALIDATION_CHANNEL, _handle_invalidation)
+    return _listener is not None
+
+
+def stop_invalidation_listener() -> None:
+    """
+    Stop the invalidation listener and clear the caches
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    for user_cache in _user_caches:
+        user_cache.clear()
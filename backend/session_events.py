@@ -0,0 +1,157 @@
+"""
+Session Expiry Events
+Counts naturally expired sessions from Redis keyspace notifications
+
+Redis publishes an `expired` keyevent for every session key whose TTL runs
+out. Each worker buffers those keys and periodically hands them to
+session_stats in one script call; the script only removes a key once, so
+every expiration is counted exactly once no matter how many workers
+receive the event. Keys this worker removed are handed to the write-behind
+persistence, which marks them as ended in the Postgres `sessions` table.
+
+Notifications are node-local, so in cluster mode every primary gets its
+own listener. They are also fire-and-forget: events published while no worker is
+listening are lost, and the sweeper's reconcile picks those sessions up.
+"""
+import asyncio
+import os
+import threading
+from collections import deque
+from typing import Dict, Any, List
+
+from redis_client import subscribe_all_nodes, enable_keyspace_notifications, get_database_index
+import session_cache
+import session_manager
+import session_persistence
+import session_stats
+
+
+# Event configuration
+EVENTS_FLUSH_INTERVAL = float(os.getenv("SESSION_EVENTS_FLUSH_INTERVAL", "2"))  # seconds
+EVENTS_BUFFER_SIZE = int(os.getenv("SESSION_EVENTS_BUFFER_SIZE", "100000"))  # Max buffered keys
+EVENTS_BATCH_SIZE = int(os.getenv("SESSION_EVENTS_BATCH_SIZE", "500"))  # Keys per script call
+
+SESSION_KEY_PREFIX = f"{session_manager.SESSION_PREFIX}:"
+
+_buffer = deque(maxlen=EVENTS_BUFFER_SIZE)
+_listeners = []
+_metrics_lock = threading.Lock()
+_metrics: Dict[str, Any] = {
+    "events_received": 0,
+    "events_dropped": 0,
+    "expirations_counted": 0,
+    "last_error": None
+}
+
+
+def _get_expired_channel() -> str:
+    """
+    Keyevent channel for expirations in the current database
+    """
+    return f"__keyevent@{get_database_index()}__:expired"
+
+
+def _handle_expired(message: Dict[str, Any]) -> None:
+    """
+    Buffer an expired session key (runs on the pub/sub thread)
+
+    Args:
+        message: Pub/sub message whose data is the expired key
+    """
+    key = message.get("data")
+    if not isinstance(key, str) or not key.startswith(SESSION_KEY_PREFIX):
+        return
+
+    # The cached copy would otherwise live until its L1 TTL
+    session_cache.cache.delete(key)
+
+    with _metrics_lock:
+        _metrics["events_received"] += 1
+        if len(_buffer) == _buffer.maxlen:
+            _metrics["events_dropped"] += 1
+    _buffer.append(key)
+
+
+def _drain(limit: int) -> List[str]:
+    """
+    Pop up to `limit` buffered keys
+    """
+    keys = []
+    while _buffer and len(keys) < limit:
+        keys.append(_buffer.popleft())
+    return keys
+
+
+def flush() -> Dict[str, int]:
+    """
+    Count buffered expirations and queue them for persistence
+
+    Returns:
+        dict: Counts for this flush (received, counted)
+    """
+    received = counted = 0
+    while _buffer:
+        keys = _drain(EVENTS_BATCH_SIZE)
+        received += len(keys)
+        removed = session_stats.expire_sessions(keys)
+        counted += len(removed)
+        session_persistence.record_ended(removed, "expired")
+
+    with _metrics_lock:
+        _metrics["expirations_counted"] += counted
+
+    return {"received": received, "counted": counted}
+
+
+def start_expiry_listener() -> bool:
+    """
+    Enable expiry notifications and start listening for them
+
+    Returns:
+        bool: True if the listener is running
+    """
+    global _listeners
+    if not _listeners:
+        enable_keyspace_notifications("Ex")
+        _listeners = subscribe_all_nodes(_get_expired_channel(), _handle_expired)
+    return bool(_listeners)
+
+
+def stop_expiry_listener() -> None:
+    """
+    Stop the expiry listener
+    """
+    global _listeners
+    for listener in _listeners:
+        listener.stop()
+    _listeners = []
+
+
+def get_metrics() -> Dict[str, Any]:
+    """
+    Get event counters
+
+    Returns:
+        dict: Event metrics including the current buffer depth
+    """
+    with _metrics_lock:
+        metrics = dict(_metrics)
+    metrics["buffered"] = len(_buffer)
+    metrics["listening"] = len(_listeners)
+    return metrics
+
+
+async def run_periodically() -> None:
+    """
+    Flush buffered expirations forever (started from the app lifespan)
+    """
+    while True:
+        await asyncio.sleep(EVENTS_FLUSH_INTERVAL)
+        if not _buffer:
+            continue
+        try:
+            await asyncio.to_thread(flush)
+            _metrics["last_error"] = None
+        except Exception as e:
+            _metrics["last_error"] = str(e)
+            print(f"⚠️  Session expiry flush failed: {e}")
@@ -0,0 +1,112 @@
+"""
+Session Maintenance
+Background sweeper for expired-session bookkeeping
+
+Redis expires session keys by itself, but the per-user indexes and the
+stats counters keep references to them. Each tick reconciles the stats
+and resumes a SCAN over the user indexes where the previous tick stopped,
+stopping once its time budget is spent, so Redis is never blocked.
+"""
+import asyncio
+import os
+import threading
+import time
+from typing import Dict, Any
+
+from redis_client import scan_page
+import session_manager
+import session_stats
+
+
+# Sweeper configuration
+SWEEP_INTERVAL = float(os.getenv("SESSION_SWEEP_INTERVAL", "5"))  # seconds between ticks
+SWEEP_TIME_BUDGET = float(os.getenv("SESSION_SWEEP_TIME_BUDGET", "0.05"))  # seconds per tick
+SWEEP_SCAN_COUNT = int(os.getenv("SESSION_SWEEP_SCAN_COUNT", "200"))  # SCAN COUNT hint
+
+_lock = threading.Lock()
+_cursor = 0
+_metrics: Dict[str, Any] = {
+    "ticks": 0,
+    "full_passes": 0,
+    "index_keys_scanned": 0,
+    "index_members_pruned": 0,
+    "stats_entries_reconciled": 0,
+    "last_tick_ms": 0.0,
+    "max_tick_ms": 0.0,
+    "last_pass_seconds": 0.0,
+    "last_error": None
+}
+_pass_started = time.monotonic()
+
+
+def sweep_tick(time_budget: float = SWEEP_TIME_BUDGET) -> Dict[str, int]:
+    """
+    Run one incremental maintenance step
+
+    Args:
+        time_budget: Seconds after which the SCAN stops for this tick
+
+    Returns:
+        dict: Counts for this tick (scanned, pruned, reconciled)
+    """
+    global _cursor, _pass_started
+
+    with _lock:
+        start = time.perf_counter()
+        deadline = start + time_budget
+        scanned = 0
+        pruned = 0
+
+        reconciled = session_stats.reconcile()
+
+        while True:
+            _cursor, index_keys = scan_page(
+                f"{session_manager.USER_INDEX_PREFIX}:*", _cursor, SWEEP_SCAN_COUNT
+            )
+            scanned += len(index_keys)
+            pruned += session_manager.prune_user_indexes(index_keys)
+
+            if _cursor == 0:
+                _metrics["full_passes"] += 1
+                _metrics["last_pass_seconds"] = round(time.monotonic() - _pass_started, 3)
+                _pass_started = time.monotonic()
+                break
+            if time.perf_counter() >= deadline:
+                break
+
+        tick_ms = (time.perf_counter() - start) * 1000
+        _metrics["ticks"] += 1
+        _metrics["index_keys_scanned"] += scanned
+        _metrics["index_members_pruned"] += pruned
+        _metrics["stats_entries_reconciled"] += reconciled
+        _metrics["last_tick_ms"] = round(tick_ms, 3)
+        _metrics["max_tick_ms"] = round(max(_metrics["max_tick_ms"], tick_ms), 3)
+
+        return {"scanned": scanned, "pruned": pruned, "reconciled": reconciled}
+
+
+def get_metrics() -> Dict[str, Any]:
+    """
+    Get sweeper counters and durations
+
+    Returns:
+        dict: Sweeper metrics
+    """
+    with _lock:
+        return dict(_metrics)
+
+
+async def run_periodically() -> None:
+    """
+    Run sweep ticks forever (started from the app lifespan)
+    """
+    while True:
+        await asyncio.sleep(SWEEP_INTERVAL)
+        try:
+            result = await asyncio.to_thread(sweep_tick)
+            _metrics["last_error"] = None
+            if result["pruned"] or result["reconciled"]:
+                print(f"🧹 Session sweep: {result}")
+        except Exception as e:
+            _metrics["last_error"] = str(e)
+            print(f"⚠️  Session sweep failed: {e}")
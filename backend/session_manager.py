@@ -1,39 +1,401 @@
 """
 Redis-based Session Management
 Handles JWT token storage and session lifecycle in Redis
+
+All of a user's keys (sessions, session index, generation counter) share
+the user ID as a cluster hash tag, so the per-session scripts always run
+within one slot.
 """
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+import base64
 import json
+import time
+import hashlib
+import os
+import re
 from redis_client import (
-    set_value,
     get_value,
-    delete_value,
     exists,
-    get_ttl,
-    extend_expiry,
-    get_keys_by_pattern,
-    delete_by_pattern
+    pipeline,
+    get_sorted_members,
+    scan_keys,
+    scan_page,
+    register_script,
+    run_script,
+    hash_tag,
+    is_unavailable_error,
+    CLUSTER_MODE
 )
+import session_stats
+import session_cache
+import session_persistence
+import serialization
 
 
 # Session configuration
 SESSION_PREFIX = "session"
+USER_INDEX_PREFIX = "session_index"  # Per-user sorted set of session keys
+GENERATION_PREFIX = "session_gen"  # Per-user session generation counter
 SESSION_EXPIRY = 3600  # 1 hour in seconds
 REFRESH_THRESHOLD = 900  # Refresh if less than 15 minutes remaining
+# last_activity is only persisted when the stored value is older than this (seconds)
+ACTIVITY_GRANULARITY = int(os.getenv("SESSION_ACTIVITY_GRANULARITY", "60"))
+# Session keys in the current layout; a "session:*" SCAN also matches other keys
+# (e.g., JSON-string sessions stored under the raw JWT by older releases)
+_SESSION_KEY_RE = re.compile(rf"^{SESSION_PREFIX}:\{{.*\}}:[0-9a-f]{{32}}$")
+
+
+class SessionStoreUnavailable(Exception):
+    """Raised when Redis can't be reached to validate a session"""
+
+
+# Sessions are stored as Redis hashes (one field per session attribute),
+# so touching last_activity or merging updates only writes the changed fields.
+
+# Reads the session, stamps last_activity and applies sliding expiry atomically.
+# last_activity is only written when the stored value is older than the cutoff
+# (ISO timestamps compare correctly as strings), so most reads write nothing.
+# When a generation key is passed, sessions from an older generation
+# ("log out everywhere" happened since the token was issued) are deleted.
+# KEYS[1] = session key, KEYS[2] = user generation key (optional)
+# ARGV[1] = last_activity timestamp, ARGV[2] = SESSION_EXPIRY, ARGV[3] = REFRESH_THRESHOLD,
+# ARGV[4] = last_activity cutoff (now - ACTIVITY_GRANULARITY), ARGV[5] = token generation (optional)
+# Returns {session_fields, ttl, refreshed}, nil if the session doesn't exist, 0 if it was revoked
+_TOUCH_SESSION_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return nil
+end
+
+if #KEYS > 1 then
+    local current = tonumber(redis.call('GET', KEYS[2]) or '0')
+    if current ~= tonumber(ARGV[5]) then
+        redis.call('UNLINK', KEYS[1])
+        return 0
+    end
+end
+
+local last_activity = redis.call('HGET', KEYS[1], 'last_activity')
+if not last_activity or last_activity < ARGV[4] then
+    redis.call('HSET', KEYS[1], 'last_activity', ARGV[1])
+end
+
+local ttl = redis.call('TTL', KEYS[1])
+local refreshed = 0
+if ttl > 0 and ttl < tonumber(ARGV[3]) then
+    ttl = tonumber(ARGV[2])
+    redis.call('EXPIRE', KEYS[1], ttl)
+    refreshed = 1
+end
+
+return {redis.call('HGETALL', KEYS[1]), ttl, refreshed}
+"""
+
+# Reads a session without touching it.
+# KEYS[1] = session key
+# Returns {session_fields, ttl} or nil if the session doesn't exist
+_LOAD_SESSION_LUA = """
+local fields = redis.call('HGETALL', KEYS[1])
+if #fields == 0 then
+    return nil
+end
+return {fields, redis.call('TTL', KEYS[1])}
+"""
+
+# Writes only the given fields of an existing session.
+# KEYS[1] = session key
+# ARGV = field1, value1, field2, value2, ...
+# Returns the session's user_id, or nil if the session doesn't exist
+_UPDATE_SESSION_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return nil
+end
+redis.call('HSET', KEYS[1], unpack(ARGV))
+return redis.call('HGET', KEYS[1], 'user_id')
+"""
+
+# Deletes a session.
+# KEYS[1] = session key
+# Returns {deleted, user_id}
+_DELETE_SESSION_LUA = """
+local user_id = redis.call('HGET', KEYS[1], 'user_id')
+return {redis.call('DEL', KEYS[1]), user_id}
+"""
+
+# Moves a legacy JSON-string session to its hash key, keeping its TTL.
+# Deleting the legacy key claims it, so concurrent workers convert it once.
+# KEYS[1] = legacy key ("session:<JWT>"), KEYS[2] = session key
+# ARGV[1] = remaining TTL (ms), ARGV[2..] = field1, value1, field2, value2, ...
+# Returns 1 if this call converted the session, 0 if it was already gone
+_MIGRATE_LEGACY_LUA = """
+if redis.call('DEL', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('HSET', KEYS[2], unpack(ARGV, 2))
+redis.call('PEXPIRE', KEYS[2], ARGV[1])
+return 1
+"""
+
+_touch_session_script = register_script(_TOUCH_SESSION_LUA)
+_load_session_script = register_script(_LOAD_SESSION_LUA)
+_update_session_script = register_script(_UPDATE_SESSION_LUA)
+_delete_session_script = register_script(_DELETE_SESSION_LUA)
+_migrate_legacy_script = register_script(_MIGRATE_LEGACY_LUA)
+
+
+def get_session_id(token: str) -> str:
+    """
+    Derive a compact, fixed-length session ID from a JWT
+
+    Args:
+        token: JWT access token
+
+    Returns:
+        str: 32-character hex digest of the token
+    """
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _get_token_subject(token: str) -> Optional[str]:
+    """
+    Read the subject claim of a JWT without verifying it
+
+    Only used to place the session key in the owner's hash slot; a forged
+    subject just points at a key that doesn't exist.
+
+    Args:
+        token: JWT access token
+
+    Returns:
+        str: The "sub" claim, or None if the token can't be parsed
+    """
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        subject = claims.get("sub")
+        return str(subject) if subject is not None else None
+    except (IndexError, ValueError, AttributeError):
+        return None
 
 
 def _get_session_key(token: str) -> str:
     """
     Generate Redis key for session
 
+    The key holds a digest of the token rather than the token itself,
+    so the JWT bytes are never stored in Redis. The token's subject is
+    the hash tag, keeping the session in the same slot as the user's
+    index and generation keys.
+
     Args:
         token: JWT access token
 
     Returns:
-        str: Redis key (e.g., "session:eyJhbGc...")
+        str: Redis key (e.g., "session:{user01}:3f2a9c...")
+    """
+    session_id = get_session_id(token)
+    return f"{SESSION_PREFIX}:{hash_tag(_get_token_subject(token) or session_id)}:{session_id}"
+
+
+def _get_user_index_key(user_id: str) -> str:
+    """
+    Generate Redis key for a user's session index
+
+    The index is a sorted set of the user's session keys scored by
+    creation time, so per-user lookups never scan the whole keyspace.
+
+    Args:
+        user_id: User ID
+
+    Returns:
+        str: Redis key (e.g., "session_index:{user01}")
+    """
+    return f"{USER_INDEX_PREFIX}:{hash_tag(user_id)}"
+
+
+def _get_generation_key(user_id: str) -> str:
+    """
+    Generate Redis key for a user's session generation counter
+
+    Args:
+        user_id: User ID
+
+    Returns:
+        str: Redis key (e.g., "session_gen:{user01}")
+    """
+    return f"{GENERATION_PREFIX}:{hash_tag(user_id)}"
+
+
+def _extend_user_index(pipe, user_id: str, expire: int) -> None:
+    """
+    Queue commands keeping the user index alive as long as its longest session
+
+    Args:
+        pipe: Redis pipeline
+        user_id: User ID
+        expire: Expiration in seconds of the session just created/refreshed
+    """
+    index_key = _get_user_index_key(user_id)
+    pipe.expire(index_key, expire, nx=True)
+    pipe.expire(index_key, expire, gt=True)
+
+
+def _index_session(pipe, session_key: str, session_data: Dict[str, Any], expire: int) -> None:
+    """
+    Queue the secondary index and stats updates for a created/refreshed session
+
+    Args:
+        pipe: Redis pipeline
+        session_key: Session Redis key
+        session_data: Session data (user_id and role are used)
+        expire: Session expiration in seconds from now
+    """
+    user_id = session_data.get("user_id")
+    if user_id:
+        _extend_user_index(pipe, user_id, expire)
+    session_stats.track_session(
+        session_key,
+        session_data.get("role", session_stats.UNKNOWN_ROLE),
+        time.time() + expire,
+        pipe=pipe
+    )
+
+
+def _touch_keys(session_key: str, user_id: Optional[str] = None,
+                generation: Optional[int] = None) -> list:
+    """
+    Build the KEYS for the touch script used by get_session
+
+    Args:
+        session_key: Session Redis key
+        user_id: Token subject, enables the generation check together with generation
+        generation: Session generation claimed by the token
+
+    Returns:
+        list: Script keys
     """
-    return f"{SESSION_PREFIX}:{token}"
+    if user_id is not None and generation is not None:
+        return [session_key, _get_generation_key(user_id)]
+    return [session_key]
+
+
+def _touch_args(now: datetime, generation: Optional[int] = None) -> list:
+    """
+    Build the ARGV for the touch script used by get_session
+
+    Args:
+        now: Current UTC time
+        generation: Session generation claimed by the token (optional)
+
+    Returns:
+        list: Script arguments
+    """
+    args = [
+        now.isoformat(),
+        SESSION_EXPIRY,
+        REFRESH_THRESHOLD,
+        (now - timedelta(seconds=ACTIVITY_GRANULARITY)).isoformat()
+    ]
+    if generation is not None:
+        args.append(int(generation))
+    return args
+
+
+def _index_refreshed_session(session_key: str, session_data: Dict[str, Any]) -> None:
+    """
+    Update the user index and stats after get_session auto-refreshed a session
+
+    Args:
+        session_key: Session Redis key
+        session_data: Session data
+    """
+    pipe = pipeline()
+    _index_session(pipe, session_key, session_data, SESSION_EXPIRY)
+    pipe.execute()
+    print(f"🔄 Session auto-refreshed for user: {session_data.get('user_id')}")
+
+
+def _unindex_session(session_key: str, user_id: Optional[str]) -> None:
+    """
+    Remove a deleted session from the user index and stats
+
+    Args:
+        session_key: Session Redis key
+        user_id: Owner of the session (if known)
+    """
+    pipe = pipeline()
+    if user_id:
+        pipe.zrem(_get_user_index_key(user_id), session_key)
+    session_stats.untrack_sessions([session_key], pipe=pipe)
+    pipe.execute()
+
+
+def _encode_fields(data: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Convert session data to hash fields
+
+    Hash fields hold strings: None values are dropped and
+    non-string values are stored with the tagged codec.
+
+    Args:
+        data: Session data
+
+    Returns:
+        dict: Field mapping for HSET
+    """
+    return {
+        field: value if isinstance(value, str) else serialization.encode(value)
+        for field, value in data.items()
+        if value is not None
+    }
+
+
+def _decode_fields(flat_fields: list) -> Dict[str, Any]:
+    """
+    Convert a flat HGETALL reply ([field, value, ...]) to a dict
+
+    Codec-tagged field values are decoded back to their original type.
+    """
+    return {
+        field: serialization.decode(value) if serialization.is_encoded(value) else value
+        for field, value in zip(flat_fields[::2], flat_fields[1::2])
+    }
+
+
+def _fetch_sessions(session_keys: list) -> Tuple[List[Dict[str, Any]], list]:
+    """
+    Load several sessions with their TTLs in a single round trip
+
+    Each session's fields and TTL are read by a pipelined server-side script.
+
+    Args:
+        session_keys: Session Redis keys
+
+    Returns:
+        tuple: (sessions with "ttl" added, keys that no longer exist)
+    """
+    if not session_keys:
+        return [], []
+
+    pipe = pipeline()
+    for key in session_keys:
+        run_script(_load_session_script, keys=[key], args=[], client=pipe)
+    results = pipe.execute()
+
+    sessions = []
+    missing_keys = []
+    for key, result in zip(session_keys, results):
+        if not result:
+            missing_keys.append(key)
+            continue
+        fields, ttl = result
+        sessions.append({
+            **_decode_fields(fields),
+            "session_id": key.split(":")[-1],
+            "ttl": ttl
+        })
+
+    return sessions, missing_keys
 
 
 def create_session(token: str, user_data: Dict[str, Any], expire: int = SESSION_EXPIRY) -> bool:
@@ -55,16 +417,28 @@ def create_session(token: str, user_data: Dict[str, Any], expire: int = SESSION_
     try:
         session_key = _get_session_key(token)
 
+        now = datetime.utcnow()
+        user_id = user_data.get("user_id")
+
         session_data = {
             **user_data,
-            "created_at": datetime.utcnow().isoformat(),
-            "last_activity": datetime.utcnow().isoformat(),
-            "token": token
+            "created_at": now.isoformat(),
+            "last_activity": now.isoformat()
         }
 
-        success = set_value(session_key, session_data, expire)
+        # Store the session and register it in the user's index in one round trip
+        pipe = pipeline()
+        pipe.hset(session_key, mapping=_encode_fields(session_data))
+        pipe.expire(session_key, expire)
+        if user_id:
+            pipe.zadd(_get_user_index_key(user_id), {session_key: now.timestamp()})
+        _index_session(pipe, session_key, session_data, expire)
+        # HSET returns the number of new fields (0 when re-creating an existing
+        # session), so success is judged by the EXPIRE on the key
+        success = bool(pipe.execute()[1])
 
         if success:
+            session_persistence.record_session(session_key, session_data, expire)
             print(f"✅ Session created for user: {user_data.get('user_id')}")
         else:
             print(f"❌ Failed to create session for user: {user_data.get('user_id')}")
@@ -76,34 +450,63 @@ def create_session(token: str, user_data: Dict[str, Any], expire: int = SESSION_
         return False
 
 
-def get_session(token: str) -> Optional[Dict[str, Any]]:
+def get_session(token: str, user_id: Optional[str] = None,
+                generation: Optional[int] = None) -> Optional[Dict[str, Any]]:
     """
     Retrieve session data from Redis
 
+    Reading the session, updating last_activity and the sliding expiry
+    all happen in a single server-side script (one round trip).
+    last_activity is written at most once per ACTIVITY_GRANULARITY seconds.
+    Recently validated sessions are served from the in-process cache.
+
     Args:
         token: JWT access token
+        user_id: Token subject (optional, enables the generation check)
+        generation: Session generation claimed by the token (optional)
 
     Returns:
         dict: Session data or None if not found/expired
+
+    Raises:
+        SessionStoreUnavailable: Redis is unreachable (or its circuit is open)
     """
     try:
         session_key = _get_session_key(token)
-        session_data = get_value(session_key, deserialize=True)
 
-        if session_data:
-            # Update last activity timestamp
-            session_data["last_activity"] = datetime.utcnow().isoformat()
-            set_value(session_key, session_data, get_ttl(session_key))
+        cached = session_cache.cache.get(session_key)
+        if cached is not None:
+            return cached
+
+        result = run_script(
+            _touch_session_script,
+            keys=_touch_keys(session_key, user_id, generation),
+            args=_touch_args(datetime.utcnow(), generation),
+            raise_unavailable=True
+        )
+
+        if result == 0:
+            _unindex_session(session_key, user_id)
+            session_persistence.record_ended([session_key], "revoked")
+            print(f"🚫 Revoked session rejected for user: {user_id}")
+            return None
 
-            # Auto-refresh session if close to expiry
-            ttl = get_ttl(session_key)
-            if 0 < ttl < REFRESH_THRESHOLD:
-                extend_expiry(session_key, SESSION_EXPIRY - ttl)
-                print(f"🔄 Session auto-refreshed for user: {session_data.get('user_id')}")
+        if not result:
+            return None
 
+        fields, ttl, refreshed = result
+        session_data = _decode_fields(fields)
+
+        if refreshed:
+            _index_refreshed_session(session_key, session_data)
+        session_persistence.record_session(session_key, session_data, ttl)
+
+        session_cache.cache.set(session_key, session_data, ttl if ttl > 0 else None)
         return session_data
 
     except Exception as e:
+        if is_unavailable_error(e):
+            raise SessionStoreUnavailable(str(e)) from e
         print(f"❌ Error getting session: {e}")
         return None
 
@@ -112,6 +515,8 @@ def update_session(token: str, update_data: Dict[str, Any]) -> bool:
     """
     Update session data in Redis
 
+    Only the given fields (plus last_activity) are written; the TTL is preserved.
+
     Args:
         token: JWT access token
         update_data: Data to update in session
@@ -121,29 +526,54 @@ def update_session(token: str, update_data: Dict[str, Any]) -> bool:
     """
     try:
         session_key = _get_session_key(token)
-        session_data = get_value(session_key, deserialize=True)
 
-        if not session_data:
+        fields = _encode_fields({
+            **update_data,
+            "last_activity": datetime.utcnow().isoformat()
+        })
+        args = [item for pair in fields.items() for item in pair]
+
+        user_id = run_script(_update_session_script, keys=[session_key], args=args)
+
+        if user_id is None:
             print(f"❌ Session not found for token: {token[:20]}...")
             return False
 
-        # Merge update data
-        session_data.update(update_data)
-        session_data["last_activity"] = datetime.utcnow().isoformat()
+        session_cache.invalidate_key(session_key)
+        print(f"✅ Session updated for user: {user_id}")
+        return True
 
-        # Preserve TTL
-        ttl = get_ttl(session_key)
-        success = set_value(session_key, session_data, ttl if ttl > 0 else SESSION_EXPIRY)
+    except Exception as e:
+        print(f"❌ Error updating session: {e}")
+        return False
 
-        if success:
-            print(f"✅ Session updated for user: {session_data.get('user_id')}")
 
-        return success
+def _delete_session_key(session_key: str, invalidate: bool = True) -> bool:
+    """
+    Delete a session by its Redis key, keeping the indexes and stats in sync
 
-    except Exception as e:
-        print(f"❌ Error updating session: {e}")
+    Args:
+        session_key: Session Redis key
+        invalidate: Broadcast the cache invalidation for this key (default: True)
+
+    Returns:
+        bool: True if a session was deleted
+    """
+    result = run_script(_delete_session_script, keys=[session_key], args=[])
+
+    if invalidate:
+        session_cache.invalidate_key(session_key)
+
+    if not result or not result[0]:
         return False
 
+    _, user_id = result
+    _unindex_session(session_key, user_id)
+    session_persistence.record_ended([session_key], "logout")
+
+    print(f"✅ Session deleted for user: {user_id}")
+    return True
+
 
 def delete_session(token: str) -> bool:
     """
@@ -156,24 +586,35 @@ def delete_session(token: str) -> bool:
         bool: True if deleted successfully
     """
     try:
-        session_key = _get_session_key(token)
-        session_data = get_value(session_key, deserialize=True)
-
-        success = delete_value(session_key)
-
-        if success and session_data:
-            print(f"✅ Session deleted for user: {session_data.get('user_id')}")
-        elif not session_data:
+        if not _delete_session_key(_get_session_key(token)):
             print(f"⚠️  Session not found (may be already expired)")
-            success = True  # Consider it success if session doesn't exist
 
-        return success
+        return True  # Consider it success if session doesn't exist
 
     except Exception as e:
         print(f"❌ Error deleting session: {e}")
         return False
 
 
+def get_session_info(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Read a session with its TTL without touching last_activity
+
+    Args:
+        token: JWT access token
+
+    Returns:
+        dict: Session data with "session_id" and "ttl", or None if not found
+    """
+    try:
+        sessions, _ = _fetch_sessions([_get_session_key(token)])
+        return sessions[0] if sessions else None
+
+    except Exception as e:
+        print(f"❌ Error getting session info: {e}")
+        return None
+
+
 def session_exists(token: str) -> bool:
     """
     Check if session exists in Redis
@@ -205,24 +646,29 @@ def refresh_session(token: str, new_expiry: Optional[int] = None) -> bool:
     """
     try:
         session_key = _get_session_key(token)
+        expiry = new_expiry if new_expiry else SESSION_EXPIRY
 
-        if not exists(session_key):
-            print(f"❌ Cannot refresh: session not found")
-            return False
+        # Same script as get_session, with a threshold and cutoff that always write
+        now = datetime.utcnow().isoformat()
+        result = run_script(
+            _touch_session_script,
+            keys=[session_key],
+            args=[now, expiry, 2 ** 31, now]
+        )
 
-        session_data = get_value(session_key, deserialize=True)
-        if not session_data:
+        if not result:
+            print(f"❌ Cannot refresh: session not found")
             return False
 
-        session_data["last_activity"] = datetime.utcnow().isoformat()
+        session_data = _decode_fields(result[0])
 
-        expiry = new_expiry if new_expiry else SESSION_EXPIRY
-        success = set_value(session_key, session_data, expiry)
+        pipe = pipeline()
+        _index_session(pipe, session_key, session_data, expiry)
+        pipe.execute()
+        session_persistence.record_session(session_key, session_data, expiry)
 
-        if success:
-            print(f"✅ Session refreshed for user: {session_data.get('user_id')}")
-
-        return success
+        print(f"✅ Session refreshed for user: {session_data.get('user_id')}")
+        return True
 
     except Exception as e:
         print(f"❌ Error refreshing session: {e}")
@@ -233,24 +679,31 @@ def get_user_sessions(user_id: str) -> list:
     """
     Get all active sessions for a user
 
+    Uses the per-user session index, so the cost is proportional to the
+    user's own sessions. Index members whose session has expired are
+    pruned lazily.
+
     Args:
         user_id: User ID
 
     Returns:
-        list: List of session data dictionaries
+        list: List of session data dictionaries (most recent first)
     """
     try:
-        pattern = f"{SESSION_PREFIX}:*"
-        all_keys = get_keys_by_pattern(pattern)
-
-        user_sessions = []
-        for key in all_keys:
-            session_data = get_value(key, deserialize=True)
-            if session_data and session_data.get("user_id") == user_id:
-                user_sessions.append({
-                    **session_data,
-                    "ttl": get_ttl(key)
-                })
+        index_key = _get_user_index_key(user_id)
+
+        session_keys = get_sorted_members(index_key)
+
+        if not session_keys:
+            return []
+
+        user_sessions, expired_keys = _fetch_sessions(session_keys)
+
+        # Lazy pruning of index members whose session already expired
+        if expired_keys:
+            pipe = pipeline()
+            pipe.zrem(index_key, *expired_keys)
+            pipe.execute()
 
         return user_sessions
 
@@ -259,6 +712,99 @@ def get_user_sessions(user_id: str) -> list:
         return []
 
 
+def get_user_generation(user_id: str) -> int:
+    """
+    Get a user's current session generation
+
+    Args:
+        user_id: User ID
+
+    Returns:
+        int: Current generation (0 if never bumped)
+    """
+    return int(get_value(_get_generation_key(user_id), deserialize=False) or 0)
+
+
+def bump_user_generation(user_id: str) -> int:
+    """
+    Log a user out everywhere with a single INCR
+
+    Every token issued before the bump carries an older generation and
+    is rejected by get_session, however many sessions exist.
+
+    Args:
+        user_id: User ID
+
+    Returns:
+        int: New generation
+    """
+    pipe = pipeline()
+    pipe.incr(_get_generation_key(user_id))
+    if not CLUSTER_MODE:
+        session_cache.invalidate_user(user_id, pipe=pipe)
+    generation = pipe.execute()[0]
+    if CLUSTER_MODE:
+        # Cluster pipelines can't PUBLISH; broadcast once the INCR is applied
+        session_cache.invalidate_user(user_id)
+
+    print(f"✅ Session generation bumped to {generation} for user: {user_id}")
+    return generation
+
+
+def revoke_user_sessions(user_ids: List[str]) -> Dict[str, int]:
+    """
+    Delete all sessions of several users in two round trips
+
+    The first pipeline reads every user's session index, the second
+    UNLINKs all sessions and indexes, updates the stats, bumps each
+    user's generation (so outstanding refresh tokens stop working too) and
+    broadcasts the cache invalidations. Every key command touches a single
+    slot, so a cluster pipeline can route each one to its node; PUBLISH
+    can't be pipelined on a cluster, so there the invalidations are sent
+    after the pipeline runs.
+
+    Args:
+        user_ids: User IDs
+
+    Returns:
+        dict: Number of sessions deleted per user ID
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids:
+        return {}
+
+    pipe = pipeline()
+    for user_id in user_ids:
+        pipe.zrange(_get_user_index_key(user_id), 0, -1)
+    keys_per_user = pipe.execute()
+
+    all_keys = [key for session_keys in keys_per_user for key in session_keys]
+
+    pipe = pipeline()
+    for key in all_keys:
+        pipe.unlink(key)
+    for user_id in user_ids:
+        pipe.unlink(_get_user_index_key(user_id))
+    session_stats.untrack_sessions(all_keys, pipe=pipe)
+    for user_id in user_ids:
+        pipe.incr(_get_generation_key(user_id))
+        if not CLUSTER_MODE:
+            session_cache.invalidate_user(user_id, pipe=pipe)
+    results = pipe.execute()
+    if CLUSTER_MODE:
+        for user_id in user_ids:
+            session_cache.invalidate_user(user_id)
+    session_persistence.record_ended(all_keys, "revoked")
+
+    deleted = {}
+    position = 0
+    for user_id, session_keys in zip(user_ids, keys_per_user):
+        deleted[user_id] = sum(results[position:position + len(session_keys)])
+        position += len(session_keys)
+
+    return deleted
+
+
 def delete_user_sessions(user_id: str) -> int:
     """
     Delete all sessions for a specific user
@@ -270,12 +816,7 @@ def delete_user_sessions(user_id: str) -> int:
         int: Number of sessions deleted
     """
     try:
-        user_sessions = get_user_sessions(user_id)
-        deleted_count = 0
-
-        for session in user_sessions:
-            if delete_session(session.get("token")):
-                deleted_count += 1
+        deleted_count = revoke_user_sessions([user_id]).get(user_id, 0)
 
         print(f"✅ Deleted {deleted_count} sessions for user: {user_id}")
         return deleted_count
@@ -285,52 +826,107 @@ def delete_user_sessions(user_id: str) -> int:
         return 0
 
 
-def get_all_sessions() -> list:
+def get_all_sessions(cursor: int = 0, count: int = 100) -> Tuple[int, list]:
     """
-    Get all active sessions (admin only)
+    Get one page of active sessions (admin only)
+
+    Pages are produced by a SCAN cursor, so listing sessions never
+    blocks Redis and only one page is held in memory at a time.
+    Keys outside the current session layout are skipped, so a leftover
+    legacy key can't fail the page.
+
+    Args:
+        cursor: Cursor returned by the previous page (0 to start)
+        count: Approximate number of keys to examine for this page
 
     Returns:
-        list: List of all session data
+        tuple: (next_cursor, sessions) - next_cursor is 0 on the last page
     """
     try:
-        pattern = f"{SESSION_PREFIX}:*"
-        all_keys = get_keys_by_pattern(pattern)
-
-        all_sessions = []
-        for key in all_keys:
-            session_data = get_value(key, deserialize=True)
-            if session_data:
-                all_sessions.append({
-                    **session_data,
-                    "ttl": get_ttl(key)
-                })
-
-        return all_sessions
+        next_cursor, keys = scan_page(f"{SESSION_PREFIX}:*", cursor, count)
+        sessions, _ = _fetch_sessions([key for key in keys if _SESSION_KEY_RE.match(key)])
+        return next_cursor, sessions
 
     except Exception as e:
         print(f"❌ Error getting all sessions: {e}")
-        return []
+        return 0, []
+
+
+def prune_user_indexes(index_keys: List[str]) -> int:
+    """
+    Remove members whose session no longer exists from user indexes
+
+    Costs three pipelined round trips per call, whatever the batch size.
+
+    Args:
+        index_keys: User index Redis keys (e.g., from a SCAN of "session_index:*")
+
+    Returns:
+        int: Number of stale members removed
+    """
+    if not index_keys:
+        return 0
+
+    pipe = pipeline()
+    for index_key in index_keys:
+        pipe.zrange(index_key, 0, -1)
+    members_per_index = pipe.execute()
+
+    members = [
+        (index_key, member)
+        for index_key, index_members in zip(index_keys, members_per_index)
+        for member in index_members
+    ]
+    if not members:
+        return 0
+
+    pipe = pipeline()
+    for _, member in members:
+        pipe.exists(member)
+    existing = pipe.execute()
+
+    stale = {}
+    for (index_key, member), found in zip(members, existing):
+        if not found:
+            stale.setdefault(index_key, []).append(member)
+    if not stale:
+        return 0
+
+    pipe = pipeline()
+    for index_key, stale_members in stale.items():
+        pipe.zrem(index_key, *stale_members)
+    return sum(pipe.execute())
 
 
 def cleanup_expired_sessions() -> int:
     """
-    Cleanup expired sessions (Redis handles this automatically,
-    but this can be used for manual cleanup)
+    Cleanup bookkeeping left behind by expired sessions
+
+    Redis expires the session keys themselves; this runs a full pass
+    that prunes the per-user indexes and the stats counters. The
+    background maintenance task does the same work incrementally.
 
     Returns:
-        int: Number of sessions cleaned up
+        int: Number of stale index members and stats entries removed
     """
     try:
-        pattern = f"{SESSION_PREFIX}:*"
-        all_keys = get_keys_by_pattern(pattern)
-
         cleaned_count = 0
-        for key in all_keys:
-            ttl = get_ttl(key)
-            if ttl == -2:  # Key doesn't exist (already expired)
-                cleaned_count += 1
 
-        print(f"✅ Cleaned up {cleaned_count} expired sessions")
+        batch = []
+        for index_key in scan_keys(f"{USER_INDEX_PREFIX}:*"):
+            batch.append(index_key)
+            if len(batch) >= 500:
+                cleaned_count += prune_user_indexes(batch)
+                batch = []
+        cleaned_count += prune_user_indexes(batch)
+
+        while True:
+            reconciled = session_stats.reconcile()
+            cleaned_count += reconciled
+            if reconciled < session_stats.RECONCILE_BATCH:
+                break
+
+        print(f"✅ Cleaned up {cleaned_count} expired session entries")
         return cleaned_count
 
     except Exception as e:
@@ -338,32 +934,131 @@ def cleanup_expired_sessions() -> int:
         return 0
 
 
-def get_session_stats() -> Dict[str, Any]:
+def _migrate_legacy_batch(legacy_keys: List[str]) -> int:
     """
-    Get session statistics
+    Convert a batch of legacy JSON-string sessions in three round trips
+
+    Args:
+        legacy_keys: Legacy session keys ("session:<JWT>")
 
     Returns:
-        dict: Session statistics
+        int: Number of sessions converted
     """
+    if not legacy_keys:
+        return 0
+
+    pipe = pipeline()
+    for key in legacy_keys:
+        pipe.get(key)
+        pipe.pttl(key)
+    # Keys that aren't strings fail GET with WRONGTYPE; those are skipped
+    results = pipe.execute(raise_on_error=False)
+
+    candidates = []
+    for key, raw, pttl in zip(legacy_keys, results[::2], results[1::2]):
+        if not isinstance(raw, str) or not isinstance(pttl, int) or pttl <= 0:
+            continue
+        try:
+            session_data = json.loads(raw)
+        except ValueError:
+            continue
+        if not isinstance(session_data, dict):
+            continue
+
+        token = key[len(SESSION_PREFIX) + 1:]
+        session_data.pop("token", None)  # The raw JWT is no longer stored
+        fields = _encode_fields(session_data)
+        if fields:
+            candidates.append((key, _get_session_key(token), session_data, fields, pttl))
+
+    if not candidates:
+        return 0
+
+    pipe = pipeline()
+    for key, session_key, _, fields, pttl in candidates:
+        args = [pttl] + [item for pair in fields.items() for item in pair]
+        run_script(_migrate_legacy_script, keys=[key, session_key], args=args, client=pipe)
+    converted = pipe.execute()
+
+    migrated = [candidate for candidate, done in zip(candidates, converted) if done]
+    if not migrated:
+        return 0
+
+    pipe = pipeline()
+    for _, session_key, session_data, _, pttl in migrated:
+        expire = max(1, pttl // 1000)
+        user_id = session_data.get("user_id")
+        if user_id:
+            try:
+                created_at = datetime.fromisoformat(session_data.get("created_at")).timestamp()
+            except (TypeError, ValueError):
+                created_at = time.time()
+            pipe.zadd(_get_user_index_key(user_id), {session_key: created_at})
+        _index_session(pipe, session_key, session_data, expire)
+    pipe.execute()
+
+    for _, session_key, session_data, _, pttl in migrated:
+        session_persistence.record_session(session_key, session_data, max(1, pttl // 1000))
+
+    return len(migrated)
+
+
+def migrate_legacy_sessions(batch_size: int = 500) -> int:
+    """
+    Convert sessions stored by older releases to the current layout
+
+    Older releases kept each session as a JSON string under "session:<JWT>".
+    Each one is moved to its hash key with its remaining TTL and added to
+    the user index, stats and write-behind persistence, so logged-in users
+    stay logged in across the upgrade. Run once at startup; workers starting
+    together convert each session once.
+
+    Older releases only ran against a single server, and the legacy and
+    current keys of a session live in different cluster slots, so nothing
+    is converted in cluster mode.
+
+    Args:
+        batch_size: Number of legacy keys converted per batch
+
+    Returns:
+        int: Number of sessions converted
+    """
+    if CLUSTER_MODE:
+        return 0
+
     try:
-        all_sessions = get_all_sessions()
+        migrated = 0
+        batch = []
+        for key in scan_keys(f"{SESSION_PREFIX}:*", count=batch_size):
+            if _SESSION_KEY_RE.match(key):
+                continue
+            batch.append(key)
+            if len(batch) >= batch_size:
+                migrated += _migrate_legacy_batch(batch)
+                batch = []
+        migrated += _migrate_legacy_batch(batch)
+
+        if migrated:
+            print(f"✅ Migrated {migrated} legacy sessions")
+        return migrated
 
-        stats = {
-            "total_sessions": len(all_sessions),
-            "sessions_by_role": {},
-            "average_ttl": 0
-        }
+    except Exception as e:
+        print(f"❌ Error migrating legacy sessions: {e}")
+        return 0
 
-        if all_sessions:
-            ttl_sum = 0
-            for session in all_sessions:
-                role = session.get("role", "unknown")
-                stats["sessions_by_role"][role] = stats["sessions_by_role"].get(role, 0) + 1
-                ttl_sum += session.get("ttl", 0)
 
-            stats["average_ttl"] = ttl_sum // len(all_sessions)
+def get_session_stats() -> Dict[str, Any]:
+    """
+    Get session statistics
+
+    Reads the incrementally maintained counters in session_stats,
+    so the cost doesn't grow with the number of sessions.
 
-        return stats
+    Returns:
+        dict: Session statistics
+    """
+    try:
+        return session_stats.get_stats()
 
     except Exception as e:
         print(f"❌ Error getting session stats: {e}")
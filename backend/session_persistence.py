@@ -0,0 +1,291 @@
+"""
+Session Write-Behind Persistence
+Batched copy of the session lifecycle into the Postgres `sessions` table
+
+Redis stays the source of truth for live sessions. session_manager records
+create/touch/end events here with a dictionary update (no I/O), and a
+background task flushes them every few seconds: all pending rows go out
+as multi-row INSERT ... ON CONFLICT upserts, followed by one UPDATE per
+end reason. Events for the same session are coalesced between flushes.
+
+If Postgres is slow or down, events pile up to SESSION_PERSIST_MAX_PENDING
+and further ones are dropped (and counted); requests never wait on it.
+"""
+import asyncio
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+
+from sqlalchemy import DateTime, String, column, update, values
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import insert
+
+from database import SessionLocal
+from models import SessionRecord
+
+
+# Persistence configuration
+PERSIST_ENABLED = os.getenv("SESSION_PERSIST_ENABLED", "false").lower() == "true"
+PERSIST_INTERVAL = float(os.getenv("SESSION_PERSIST_INTERVAL", "5"))  # seconds
+PERSIST_BATCH_SIZE = int(os.getenv("SESSION_PERSIST_BATCH_SIZE", "500"))  # Rows per statement
+PERSIST_MAX_PENDING = int(os.getenv("SESSION_PERSIST_MAX_PENDING", "50000"))  # Queued sessions
+
+_lock = threading.Lock()
+_flush_lock = threading.Lock()
+_upserts: Dict[str, Dict[str, Any]] = {}  # session_id -> row
+_ends: Dict[str, Dict[str, Any]] = {}  # session_id -> {ended_at, end_reason}
+_metrics: Dict[str, Any] = {
+    "events_queued": 0,
+    "events_dropped": 0,
+    "rows_upserted": 0,
+    "rows_ended": 0,
+    "flushes": 0,
+    "failed_flushes": 0,
+    "last_flush_ms": 0.0,
+    "last_error": None
+}
+
+
+def _session_id(session_key: str) -> str:
+    """
+    Session ID (table primary key) from a session Redis key
+    """
+    return session_key.rsplit(":", 1)[-1]
+
+
+def _parse_time(value: Any) -> Optional[datetime]:
+    """
+    Parse an ISO timestamp stored in the session hash
+    """
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _queue(target: Dict[str, Dict[str, Any]], session_id: str, row: Dict[str, Any]) -> None:
+    """
+    Coalesce an event into a pending map, dropping it if the queue is full
+    """
+    with _lock:
+        if session_id not in target and len(_upserts) + len(_ends) >= PERSIST_MAX_PENDING:
+            _metrics["events_dropped"] += 1
+            return
+        target.setdefault(session_id, {}).update(row)
+        _metrics["events_queued"] += 1
+
+
+def record_session(session_key: str, session_data: Dict[str, Any], ttl: int) -> None:
+    """
+    Queue an upsert for a created, touched or refreshed session
+
+    Args:
+        session_key: Session Redis key
+        session_data: Session data (as stored in Redis)
+        ttl: Remaining lifetime in seconds
+    """
+    if not PERSIST_ENABLED or not session_data.get("user_id"):
+        return
+
+    now = datetime.utcnow()
+    _queue(_upserts, _session_id(session_key), {
+        "id": _session_id(session_key),
+        "user_id": session_data.get("user_id"),
+        "created_at": _parse_time(session_data.get("created_at")) or now,
+        "last_activity": _parse_time(session_data.get("last_activity")) or now,
+        "expires_at": now + timedelta(seconds=max(ttl, 0)),
+        "ip_address": session_data.get("ip_address"),
+        "user_agent": session_data.get("user_agent"),
+        "refresh_token": session_data.get("refresh_token_id"),
+        "is_active": True
+    })
+
+
+def record_ended(session_keys: List[str], reason: str) -> None:
+    """
+    Queue sessions to be marked as ended
+
+    Args:
+        session_keys: Session Redis keys
+        reason: End reason (expired, logout, revoked)
+    """
+    if not PERSIST_ENABLED:
+        return
+
+    now = datetime.utcnow()
+    for session_key in session_keys:
+        _queue(_ends, _session_id(session_key), {"ended_at": now, "end_reason": reason})
+
+
+def _chunks(items: List[Any], size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _upsert_statement(rows: List[Dict[str, Any]]):
+    """
+    Multi-row INSERT ... ON CONFLICT DO UPDATE for session rows
+    """
+    stmt = insert(SessionRecord).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[SessionRecord.id],
+        set_={
+            "last_activity": stmt.excluded.last_activity,
+            "expires_at": stmt.excluded.expires_at
+        }
+    )
+
+
+def _write_upserts(db, rows: List[Dict[str, Any]]) -> int:
+    """
+    Upsert rows one chunk (and transaction) at a time
+
+    A chunk rejected by a constraint (e.g., the user was deleted after the
+    event was queued) is retried row by row, so only the offending rows
+    are lost.
+
+    Returns:
+        int: Rows dropped
+    """
+    dropped = 0
+    for chunk in _chunks(rows, PERSIST_BATCH_SIZE):
+        try:
+            db.execute(_upsert_statement(chunk))
+            db.commit()
+            continue
+        except IntegrityError:
+            db.rollback()
+
+        for row in chunk:
+            try:
+                db.execute(_upsert_statement([row]))
+                db.commit()
+            except IntegrityError as e:
+                db.rollback()
+                dropped += 1
+                print(f"⚠️  Dropped session row {row['id']} for user {row['user_id']}: {e.orig}")
+    return dropped
+
+
+def _write_ends(db, ends: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Mark sessions as ended, one UPDATE ... FROM (VALUES ...) per reason and chunk
+
+    Each session keeps its own ended_at from the VALUES list.
+    """
+    by_reason: Dict[str, List[tuple]] = {}
+    for session_id, end in ends.items():
+        by_reason.setdefault(end["end_reason"], []).append((session_id, end["ended_at"]))
+    for reason, session_ends in by_reason.items():
+        for chunk in _chunks(session_ends, PERSIST_BATCH_SIZE):
+            ended = values(
+                column("id", String), column("ended_at", DateTime), name="ended"
+            ).data(chunk)
+            db.execute(
+                update(SessionRecord)
+                .where(SessionRecord.id == ended.c.id, SessionRecord.is_active.is_(True))
+                .values(is_active=False, ended_at=ended.c.ended_at, end_reason=reason)
+            )
+    db.commit()
+
+
+def _write(rows: List[Dict[str, Any]], ends: Dict[str, Dict[str, Any]]) -> int:
+    """
+    Write one batch of upserts, then ends
+
+    Returns:
+        int: Upsert rows dropped because a constraint rejected them
+    """
+    db = SessionLocal()
+    try:
+        dropped = _write_upserts(db, rows)
+        _write_ends(db, ends)
+        return dropped
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def flush() -> Dict[str, int]:
+    """
+    Write all pending events to Postgres
+
+    Rows rejected by a constraint are dropped individually; if the write
+    fails otherwise (e.g., Postgres is down), the rest of the batch is
+    dropped (and counted) rather than retried, so nothing can block later
+    events.
+
+    Returns:
+        dict: Rows upserted and ended by this flush
+    """
+    global _upserts, _ends
+
+    with _flush_lock:
+        with _lock:
+            upserts, _upserts = _upserts, {}
+            ends, _ends = _ends, {}
+
+        if not upserts and not ends:
+            return {"upserted": 0, "ended": 0}
+
+        start = datetime.utcnow()
+        try:
+            dropped = _write(list(upserts.values()), ends)
+        except Exception as e:
+            with _lock:
+                _metrics["failed_flushes"] += 1
+                _metrics["events_dropped"] += len(upserts) + len(ends)
+                _metrics["last_error"] = str(e)
+            raise
+
+        with _lock:
+            _metrics["flushes"] += 1
+            _metrics["rows_upserted"] += len(upserts) - dropped
+            _metrics["events_dropped"] += dropped
+            _metrics["rows_ended"] += len(ends)
+            _metrics["last_flush_ms"] = round((datetime.utcnow() - start).total_seconds() * 1000, 3)
+            _metrics["last_error"] = None
+
+        return {"upserted": len(upserts) - dropped, "ended": len(ends)}
+
+
+def get_metrics() -> Dict[str, Any]:
+    """
+    Get write-behind counters
+
+    Returns:
+        dict: Persistence metrics including the current queue depth
+    """
+    with _lock:
+        metrics = dict(_metrics)
+        metrics["pending"] = len(_upserts) + len(_ends)
+    metrics["enabled"] = PERSIST_ENABLED
+    return metrics
+
+
+async def run_periodically() -> None:
+    """
+    Flush pending events forever (started from the app lifespan)
+
+    On cancellation a last flush writes whatever is still queued.
+    """
+    if not PERSIST_ENABLED:
+        return
+    try:
+        while True:
+            await asyncio.sleep(PERSIST_INTERVAL)
+            try:
+                await asyncio.to_thread(flush)
+            except Exception as e:
+                print(f"⚠️  Session persistence flush failed: {e}")
+    except asyncio.CancelledError:
+        try:
+            await asyncio.to_thread(flush)
+        except Exception as e:
+            print(f"⚠️  Final session persistence flush failed: {e}")
+        raise
@@ -0,0 +1,212 @@
+"""
+Incremental Session Statistics
+Session counters kept in Redis so stats reads never scan the keyspace
+
+Every stats key carries the same hash tag, so the multi-role scripts
+run in a single cluster slot.
+"""
+import time
+from typing import Dict, Any, List
+
+from redis_client import pipeline, register_script, run_script, hash_tag
+from schemas import UserRole
+
+
+# Stats configuration
+STATS_PREFIX = f"session_stats:{hash_tag('stats')}"
+EXPIRY_SUM_KEY = f"{STATS_PREFIX}:expiry_sum"  # Sum of tracked expiry timestamps
+EXPIRED_KEY = f"{STATS_PREFIX}:expired"  # Hash of naturally expired sessions per role
+UNKNOWN_ROLE = "unknown"
+SESSION_ROLES = [role.value for role in UserRole] + [UNKNOWN_ROLE]
+RECONCILE_BATCH = 1000  # Max expired entries removed per role per reconcile
+
+
+# Each role has a sorted set of session keys scored by expiry timestamp.
+# Counts are ZCARDs, and the average TTL comes from the running sum of scores.
+
+# Adds or rescores one session and keeps the expiry sum in step.
+# KEYS[1] = role sorted set, KEYS[2] = expiry sum
+# ARGV[1] = session key, ARGV[2] = expiry timestamp
+_TRACK_LUA = """
+local old = redis.call('ZSCORE', KEYS[1], ARGV[1])
+redis.call('ZADD', KEYS[1], ARGV[2], ARGV[1])
+redis.call('INCRBY', KEYS[2], tonumber(ARGV[2]) - tonumber(old or 0))
+return 1
+"""
+
+# Removes sessions from whichever role set holds them. In expiry mode each
+# removal is also counted in the expired hash; since only one caller can
+# remove a member, every expiration is counted once across all workers.
+# KEYS[1..n-2] = role sorted sets, KEYS[n-1] = expiry sum, KEYS[n] = expired hash
+# ARGV[1] = "1" to count removals as expirations, ARGV[2..] = session keys
+# Returns the removed session keys
+_UNTRACK_LUA = """
+local sum_key = KEYS[#KEYS - 1]
+local expired_key = KEYS[#KEYS]
+local removed = {}
+for i = 1, #KEYS - 2 do
+    local role = string.match(KEYS[i], '[^:]+$')
+    for j = 2, #ARGV do
+        local score = redis.call('ZSCORE', KEYS[i], ARGV[j])
+        if score then
+            redis.call('ZREM', KEYS[i], ARGV[j])
+            redis.call('DECRBY', sum_key, tonumber(score))
+            if ARGV[1] == '1' then
+                redis.call('HINCRBY', expired_key, role, 1)
+            end
+            table.insert(removed, ARGV[j])
+        end
+    end
+end
+return removed
+"""
+
+# Drops entries whose expiry has passed (sessions Redis already expired)
+# and counts them as expirations.
+# KEYS[1..n-2] = role sorted sets, KEYS[n-1] = expiry sum, KEYS[n] = expired hash
+# ARGV[1] = current timestamp, ARGV[2] = max entries per role set
+_RECONCILE_LUA = """
+local sum_key = KEYS[#KEYS - 1]
+local expired_key = KEYS[#KEYS]
+local removed = 0
+for i = 1, #KEYS - 2 do
+    local role = string.match(KEYS[i], '[^:]+$')
+    local expired = redis.call('ZRANGEBYSCORE', KEYS[i], '-inf', ARGV[1], 'WITHSCORES', 'LIMIT', 0, ARGV[2])
+    for j = 1, #expired, 2 do
+        redis.call('ZREM', KEYS[i], expired[j])
+        redis.call('DECRBY', sum_key, tonumber(expired[j + 1]))
+        removed = removed + 1
+    end
+    if #expired > 0 then
+        redis.call('HINCRBY', expired_key, role, #expired / 2)
+    end
+end
+return removed
+"""
+
+_track_script = register_script(_TRACK_LUA)
+_untrack_script = register_script(_UNTRACK_LUA)
+_reconcile_script = register_script(_RECONCILE_LUA)
+
+
+def _get_role_key(role: str) -> str:
+    """
+    Generate Redis key for a role's session set
+
+    Args:
+        role: User role
+
+    Returns:
+        str: Redis key (e.g., "session_stats:{stats}:role:admin")
+    """
+    if role not in SESSION_ROLES:
+        role = UNKNOWN_ROLE
+    return f"{STATS_PREFIX}:role:{role}"
+
+
+def _all_stats_keys() -> List[str]:
+    """
+    Keys passed to the multi-role scripts (role sets, expiry sum, expired hash)
+    """
+    return [_get_role_key(role) for role in SESSION_ROLES] + [EXPIRY_SUM_KEY, EXPIRED_KEY]
+
+
+def track_session(session_key: str, role: str, expires_at: int, pipe=None) -> None:
+    """
+    Count a session, or update its expiry after a refresh
+
+    Args:
+        session_key: Session Redis key
+        role: User role stored in the session
+        expires_at: Unix timestamp when the session expires
+        pipe: Pipeline to queue the update on (optional)
+    """
+    run_script(
+        _track_script,
+        keys=[_get_role_key(role), EXPIRY_SUM_KEY],
+        args=[session_key, int(expires_at)],
+        client=pipe
+    )
+
+
+def untrack_sessions(session_keys: List[str], pipe=None) -> None:
+    """
+    Stop counting deleted sessions
+
+    Args:
+        session_keys: Session Redis keys
+        pipe: Pipeline to queue the update on (optional)
+    """
+    if not session_keys:
+        return
+    run_script(_untrack_script, keys=_all_stats_keys(), args=["0", *session_keys], client=pipe)
+
+
+def expire_sessions(session_keys: List[str]) -> List[str]:
+    """
+    Stop counting sessions that Redis expired and count the expirations
+
+    Args:
+        session_keys: Expired session Redis keys
+
+    Returns:
+        list: Keys this call removed (keys already handled elsewhere are skipped)
+    """
+    if not session_keys:
+        return []
+    removed = run_script(_untrack_script, keys=_all_stats_keys(), args=["1", *session_keys])
+    return removed or []
+
+
+def reconcile(limit: int = RECONCILE_BATCH) -> int:
+    """
+    Remove sessions that expired naturally from the counters
+
+    Args:
+        limit: Max entries removed per role in this call
+
+    Returns:
+        int: Number of expired entries removed
+    """
+    removed = run_script(
+        _reconcile_script,
+        keys=_all_stats_keys(),
+        args=[int(time.time()), limit]
+    )
+    return removed or 0
+
+
+def get_stats() -> Dict[str, Any]:
+    """
+    Read session statistics from the counters
+
+    Cost depends only on the number of roles, not on the number of sessions.
+
+    Returns:
+        dict: total_sessions, sessions_by_role, average_ttl and expiration counters
+    """
+    reconcile()
+
+    pipe = pipeline()
+    for role in SESSION_ROLES:
+        pipe.zcard(_get_role_key(role))
+    pipe.get(EXPIRY_SUM_KEY)
+    pipe.hgetall(EXPIRED_KEY)
+    *counts, expiry_sum, expired = pipe.execute()
+
+    sessions_by_role = {
+        role: count for role, count in zip(SESSION_ROLES, counts) if count
+    }
+    total = sum(counts)
+
+    average_ttl = 0
+    if total:
+        average_ttl = max(0, int(expiry_sum or 0) // total - int(time.time()))
+
+    return {
+        "total_sessions": total,
+        "sessions_by_role": sessions_by_role,
+        "average_ttl": average_ttl,
+        "expired_sessions": sum(int(count) for count in expired.values()),
+        "expired_by_role": {role: int(count) for role, count in expired.items()}
+    }
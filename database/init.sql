@@ -62,17 +62,21 @@ CREATE INDEX idx_audit_logs_target ON audit_logs(target);
 -- ==========================================
 -- Sessions Table (for user sessions)
 -- ==========================================
+-- Existing databases are upgraded to this shape at backend startup
+-- (database.SESSIONS_TABLE_MIGRATION)
 CREATE TABLE IF NOT EXISTS sessions (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id VARCHAR(64) PRIMARY KEY,  -- Session ID (digest of the access token, same as Redis)
     user_id VARCHAR(100) NOT NULL,
-    access_token TEXT NOT NULL,
+    access_token TEXT,
     refresh_token TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    expires_at TIMESTAMP NOT NULL,
+    expires_at TIMESTAMP,
     last_activity TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     ip_address VARCHAR(50),
     user_agent TEXT,
     is_active BOOLEAN DEFAULT TRUE,
+    ended_at TIMESTAMP,
+    end_reason VARCHAR(20),  -- expired, logout, revoked
 
     -- Foreign key to users table
     CONSTRAINT fk_session_user FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
@@ -178,7 +182,7 @@ $$ LANGUAGE plpgsql;
 
 COMMENT ON TABLE users IS 'Main users table storing authentication and profile information';
 COMMENT ON TABLE audit_logs IS 'Audit trail for admin actions and important events';
-COMMENT ON TABLE sessions IS 'Active user sessions with JWT tokens';
+COMMENT ON TABLE sessions IS 'Session lifecycle history (live sessions are stored in Redis)';
 COMMENT ON TABLE password_reset_tokens IS 'Tokens for password reset functionality';
 COMMENT ON TABLE user_profiles IS 'Extended user profile information';
 
@@ -84,6 +84,29 @@ def require_auth(redirect_to_login: bool = True):
     return True
 
 
+def get_end_user_headers() -> dict:
+    """
+    백엔드가 사용자별 IP 요청 제한을 적용할 수 있도록 접속자 IP 헤더 반환
+
+    백엔드는 RATE_LIMIT_TRUSTED_FRONTENDS에 등록된 주소에서 온 요청에 한해
+    이 헤더를 신뢰합니다.
+
+    Returns:
+        dict: X-End-User-IP 헤더 (IP를 알 수 없으면 빈 딕셔너리)
+    """
+    try:
+        from streamlit.runtime import get_instance
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+        ctx = get_script_run_ctx()
+        client = get_instance().get_client(ctx.session_id) if ctx else None
+        remote_ip = client.request.remote_ip if client else None
+    except Exception:
+        remote_ip = None
+
+    return {'X-End-User-IP': remote_ip} if remote_ip else {}
+
+
 def authenticate_with_backend(user_id: str, password: str) -> Tuple[bool, Optional[dict], Optional[str]]:
     """
     백엔드 API를 통한 사용자 인증
@@ -101,6 +124,7 @@ def authenticate_with_backend(user_id: str, password: str) -> Tuple[bool, Option
         response = requests.post(
             "http://backend:8000/api/auth/login",
             json={"user_id": user_id, "password": password},
+            headers=get_end_user_headers(),
             timeout=5
         )
 
@@ -142,6 +166,7 @@ def register_user(user_id: str, password: str, email: str, name: str) -> Tuple[b
                 "name": name,
                 "role": "user"  # Default role for new registrations
             },
+            headers=get_end_user_headers(),
             timeout=5
         )
 